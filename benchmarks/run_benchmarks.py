@@ -0,0 +1,433 @@
+"""Benchmarks of the numerics and colour conversion hot paths.
+
+Every case is timed over repeated calls after a warm-up; the report lists
+latency percentiles and throughput, can be saved as JSON and compared
+against a previously saved baseline:
+
+    python benchmarks/run_benchmarks.py --json results.json
+    python benchmarks/run_benchmarks.py --baseline results.json
+
+A case regresses when its median latency exceeds the baseline median by
+more than ``--threshold``; the script then exits with status 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from itertools import cycle
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import scipy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from color.diagram import rasterize_chromaticity_diagram  # noqa: E402
+from color.gamut import get_gamut  # noqa: E402
+from color.space import (  # noqa: E402
+    XYZ_to_sRGB,
+    XYZ_to_sRGB_array,
+    get_srgb_encoder,
+    xyY_to_XYZ,
+    xyY_to_XYZ_array,
+)
+from numerics.bezier import (  # noqa: E402
+    IncrementalBezier,
+    de_casteljau,
+    eval_bezier_curve,
+    sample_bezier,
+)
+from numerics.control_points import ControlPointStore  # noqa: E402
+from numerics.fitting import get_bezier_fitter  # noqa: E402
+from numerics.inverse import get_spectrum_solver  # noqa: E402
+from numerics.spectral import (  # noqa: E402
+    IncrementalSpectrumXYZ,
+    calc_cmfs,
+    calc_spectrum_function,
+    calc_XYZ_batch_from_bezier,
+    calc_XYZ_from_bezier,
+    calc_XYZ_from_bezier_exact,
+    get_integrator,
+    integrate_XYZ,
+)
+from utils import _load_cached_table, load_color_matching_funcs  # noqa: E402
+
+SEED = 20240601
+
+
+class Case:
+    """A named benchmark: ``func`` processes ``items`` records per call."""
+
+    def __init__(self, name: str, func: Callable[[], object], items: int = 1) -> None:
+        self.name = name
+        self.func = func
+        self.items = items
+
+
+def random_control_points(
+    rng: np.random.Generator, n: int, batch: int = 1
+) -> np.ndarray:
+    """Function-like control point sets: increasing x, zero end values."""
+    x = np.sort(rng.random((batch, n)), axis=1)
+    y = rng.random((batch, n))
+    y[:, 0] = y[:, -1] = 0.0
+    return np.stack([x, y], axis=-1)
+
+
+def build_cases() -> List[Case]:
+    rng = np.random.default_rng(SEED)
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    cases: List[Case] = []
+
+    for n in (4, 8, 20, 50):
+        cps = random_control_points(rng, n)[0]
+        cps_list = [tuple(p) for p in cps.tolist()]
+        cases.append(
+            Case(f"de_casteljau[n={n}]", lambda c=cps_list: de_casteljau(c, 0.37))
+        )
+        for samples in (100, 1000):
+            cases.append(
+                Case(
+                    f"eval_bezier_curve[n={n},samples={samples}]",
+                    lambda c=cps_list, s=samples: eval_bezier_curve(c, s),
+                )
+            )
+            cases.append(
+                Case(
+                    f"sample_bezier[n={n},samples={samples}]",
+                    lambda c=cps, s=samples: sample_bezier(c, s),
+                )
+            )
+
+    cps = random_control_points(rng, 6)[0]
+    S_func = calc_spectrum_function(cps, wavelengths, cmfs_values)
+    cmfs = calc_cmfs(wavelengths, cmfs_values)
+    cases += [
+        Case(
+            "calc_spectrum_function",
+            lambda: calc_spectrum_function(cps, wavelengths, cmfs_values),
+        ),
+        Case("integrate_XYZ", lambda: integrate_XYZ(S_func, cmfs)),
+        Case(
+            "calc_XYZ_from_bezier[uncached]",
+            lambda: calc_XYZ_from_bezier(cps, wavelengths, cmfs_values, cache=None),
+        ),
+        Case(
+            "calc_XYZ_from_bezier[cached]",
+            lambda: calc_XYZ_from_bezier(cps, wavelengths, cmfs_values),
+        ),
+        Case(
+            "calc_XYZ_from_bezier_exact",
+            lambda: calc_XYZ_from_bezier_exact(cps, wavelengths, cmfs_values),
+        ),
+        Case(
+            "SpectralIntegrator.XYZ_from_bezier",
+            lambda i=get_integrator(wavelengths, cmfs_values): i.XYZ_from_bezier(cps),
+        ),
+    ]
+    # Dragging the second control point through precomputed positions
+    base = [tuple(p) for p in cps.tolist()]
+    xs = rng.uniform(base[0][0], base[2][0], 256).tolist()
+    ys = rng.random(256).tolist()
+    drags = {
+        "drag": [[base[0], (x, y), *base[2:]] for x, y in zip(xs, ys)],
+        "vertical drag": [[base[0], (base[1][0], y), *base[2:]] for y in ys],
+    }
+    for name, states in drags.items():
+        curve = IncrementalBezier()
+        spectrum = IncrementalSpectrumXYZ(get_integrator(wavelengths, cmfs_values))
+        cases += [
+            Case(
+                f"IncrementalBezier.update[{name}]",
+                lambda c=curve, s=cycle(states): c.update(next(s)),
+            ),
+            Case(
+                f"IncrementalSpectrumXYZ.update[{name}]",
+                lambda x=spectrum, s=cycle(states): x.update(next(s)),
+            ),
+        ]
+
+    # The same drags applied in place to a store and synced by version
+    moves = {
+        "drag": list(zip(xs, ys)),
+        "vertical drag": [(base[1][0], y) for y in ys],
+    }
+
+    def synced_drag(target, store: ControlPointStore, positions) -> Callable:
+        def step() -> object:
+            store.move(1, *next(positions))
+            return target.sync(store)
+
+        return step
+
+    for name, positions in moves.items():
+        curve_store = ControlPointStore(base)
+        spectrum_store = ControlPointStore(base)
+        spectrum = IncrementalSpectrumXYZ(get_integrator(wavelengths, cmfs_values))
+        cases += [
+            Case(
+                f"IncrementalBezier.sync[{name}]",
+                synced_drag(IncrementalBezier(), curve_store, cycle(positions)),
+            ),
+            Case(
+                f"IncrementalSpectrumXYZ.sync[{name}]",
+                synced_drag(spectrum, spectrum_store, cycle(positions)),
+            ),
+        ]
+
+    # Hit testing and ordered insertion on a fitted-size control polygon
+    store = ControlPointStore(random_control_points(rng, 500)[0])
+    targets = rng.random((256, 2)).tolist()
+    cases += [
+        Case(
+            "ControlPointStore.hit_test[n=500]",
+            lambda t=cycle(targets): store.hit_test(*next(t), 0.01, 0.02),
+        ),
+        Case(
+            "ControlPointStore.insertion_index[n=500]",
+            lambda t=cycle(targets): store.insertion_index(next(t)[0]),
+        ),
+    ]
+
+    batch = random_control_points(rng, 6, 1000)
+    cases.append(
+        Case(
+            "calc_XYZ_batch_from_bezier[B=1000]",
+            lambda: calc_XYZ_batch_from_bezier(
+                batch, wavelengths, cmfs_values, cache=None
+            ),
+            items=len(batch),
+        )
+    )
+
+    narrow = random_control_points(rng, 6, 1000)
+    narrow[..., 0] = 0.4 + 0.03 * narrow[..., 0]
+    integrator = get_integrator(wavelengths, cmfs_values)
+    cases.append(
+        Case(
+            "XYZ_from_bezier_exact[B=1000]",
+            lambda: integrator.XYZ_from_bezier_exact(batch),
+            items=len(batch),
+        )
+    )
+    for name, curves in (("broad", batch), ("narrow", narrow)):
+        cases.append(
+            Case(
+                f"XYZ_from_bezier_adaptive[{name},B=1000,tol=1e-3]",
+                lambda c=curves: integrator.XYZ_from_bezier_adaptive(c, 1e-3),
+                items=len(curves),
+            )
+        )
+
+    # Smooth measured-like spectra on a 5 nm grid
+    sample_wavelengths = np.arange(380.0, 781.0, 5.0)
+    centres = rng.uniform(420.0, 680.0, (1000, 1))
+    widths = rng.uniform(20.0, 80.0, (1000, 1))
+    spectra = np.exp(-0.5 * ((sample_wavelengths - centres) / widths) ** 2)
+    fitter = get_bezier_fitter(sample_wavelengths, 12, integrator)
+    cases.append(
+        Case(
+            "BezierFitter.fit[n=12,B=1000]",
+            lambda: fitter.fit(spectra),
+            items=len(spectra),
+        )
+    )
+
+    # Inverse solves over a 64 x 64 xy grid covering the sRGB triangle
+    solver = get_spectrum_solver(integrator)
+    grid_x, grid_y = np.meshgrid(
+        np.linspace(0.15, 0.64, 64), np.linspace(0.06, 0.6, 64)
+    )
+    target_xy = np.stack([grid_x, grid_y], axis=-1).reshape(-1, 2)
+    solved = solver.solve_xy(target_xy)
+    cases += [
+        Case(
+            "BezierSpectrumSolver.solve_xy[N=4096]",
+            lambda: solver.solve_xy(target_xy),
+            items=len(target_xy),
+        ),
+        Case(
+            "BezierSpectrumSolver.solve_XYZ[warm,N=4096]",
+            lambda: solver.solve_XYZ(solved.XYZ, solved.control_points),
+            items=len(target_xy),
+        ),
+    ]
+
+    xyY = rng.random((10000, 3))
+    XYZ = xyY_to_XYZ_array(xyY)
+    scalar_xyY = [tuple(row) for row in xyY[:1000].tolist()]
+    scalar_XYZ = [tuple(row) for row in XYZ[:1000].tolist()]
+    cases += [
+        Case(
+            "xyY_to_XYZ[scalar]",
+            lambda: [xyY_to_XYZ(*row) for row in scalar_xyY],
+            items=len(scalar_xyY),
+        ),
+        Case(
+            "XYZ_to_sRGB[scalar]",
+            lambda: [XYZ_to_sRGB(*row) for row in scalar_XYZ],
+            items=len(scalar_XYZ),
+        ),
+        Case(
+            "xyY_to_XYZ_array[N=10000]",
+            lambda: xyY_to_XYZ_array(xyY),
+            items=len(xyY),
+        ),
+        Case(
+            "XYZ_to_sRGB_array[N=10000]",
+            lambda: XYZ_to_sRGB_array(XYZ),
+            items=len(XYZ),
+        ),
+        Case(
+            "XYZ_to_sRGB_array[N=10000,lut=4096]",
+            lambda: XYZ_to_sRGB_array(XYZ, encoder=get_srgb_encoder(4096)),
+            items=len(XYZ),
+        ),
+        Case(
+            "rasterize_chromaticity_diagram[450x500]",
+            lambda: rasterize_chromaticity_diagram(450, 500),
+        ),
+    ]
+
+    # Uniform over the diagram's bounding box: about 15% inside sRGB
+    gamut_xy = rng.random((1_000_000, 2)) * (0.8, 0.9)
+    gamut_XYZ = xyY_to_XYZ_array(np.column_stack([gamut_xy, rng.random(len(gamut_xy))]))
+    srgb = get_gamut("sRGB")
+    cases += [
+        Case(
+            "Gamut.contains_xy[N=1e6]",
+            lambda: srgb.contains_xy(gamut_xy),
+            items=len(gamut_xy),
+        ),
+        Case(
+            "Gamut.distance_xy[N=1e6]",
+            lambda: srgb.distance_xy(gamut_xy),
+            items=len(gamut_xy),
+        ),
+    ]
+    for method in ("clip", "desaturate", "nearest"):
+        cases.append(
+            Case(
+                f"Gamut.map_XYZ[{method},N=1e6]",
+                lambda m=method: srgb.map_XYZ(gamut_XYZ, m),
+                items=len(gamut_XYZ),
+            )
+        )
+
+    def load_uncached() -> None:
+        _load_cached_table.cache_clear()
+        load_color_matching_funcs()
+
+    cases += [
+        Case("load_color_matching_funcs[warm]", load_color_matching_funcs),
+        Case("load_color_matching_funcs[memmap]", load_uncached),
+    ]
+    return cases
+
+
+def measure(case: Case, min_time: float, min_repeats: int) -> Dict[str, float]:
+    """Per-call latency percentiles (µs) and throughput (items/s)."""
+    for _ in range(3):
+        case.func()
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_repeats or time.perf_counter() - started < min_time:
+        start = time.perf_counter_ns()
+        case.func()
+        timings.append((time.perf_counter_ns() - start) / 1e3)
+    latencies = np.array(timings)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        "repeats": len(latencies),
+        "mean_us": float(latencies.mean()),
+        "p50_us": float(p50),
+        "p90_us": float(p90),
+        "p99_us": float(p99),
+        "throughput_per_s": case.items * 1e6 / float(latencies.mean()),
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Print the median ratio per case; return names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<48} {'baseline p50':>13} {'p50':>11} {'ratio':>7}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        ratio = stats["p50_us"] / baseline[name]["p50_us"]
+        flag = ""
+        if ratio > 1.0 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<48} {baseline[name]['p50_us']:>11.1f}µs "
+            f"{stats['p50_us']:>9.1f}µs {ratio:>7.2f}{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", type=Path, help="save results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare with saved results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="allowed relative p50 slowdown vs baseline (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run cases whose name contains this"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="seconds per case (default: 0.5)"
+    )
+    parser.add_argument("--min-repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<48} {'p50':>10} {'p90':>10} {'p99':>10} {'items/s':>12}")
+    for case in build_cases():
+        if args.filter not in case.name:
+            continue
+        stats = measure(case, args.min_time, args.min_repeats)
+        results[case.name] = stats
+        print(
+            f"{case.name:<48} {stats['p50_us']:>8.1f}µs {stats['p90_us']:>8.1f}µs "
+            f"{stats['p99_us']:>8.1f}µs {stats['throughput_per_s']:>12.0f}"
+        )
+
+    if args.json is not None:
+        report = {"environment": environment(), "seed": SEED, "results": results}
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""Headless batch computation of XYZ, xy and sRGB from spectra files.
+
+Reads Bézier control point sets or sampled spectra from CSV, NPY, raw
+binary or JSON Lines and streams them through ``numerics.spectral`` in
+chunks. Never imports PySide6, so it runs on machines without a display.
+
+Input records
+-------------
+bezier
+    CSV: one curve per row as ``x0,y0,x1,y1,...``; NPY: array of shape
+    (B, n, 2); JSONL: ``[[x, y], ...]`` or ``{"control_points": [...]}``.
+spectra
+    CSV: one spectrum per row; NPY: array of shape (B, M); raw: C-ordered
+    float32 or float64 records (``--dtype``) of ``--record-length`` values;
+    JSONL: ``[v, ...]`` or ``{"spectrum": [...]}``. Samples lie on the
+    observer's wavelength grid unless ``--wavelength-range`` is given. CSV,
+    NPY and raw spectra are streamed by ``utils.iter_spectral_library``.
+
+Output has one row per record, in input order, with columns
+X, Y, Z, x, y, R, G, B. R, G, B is the 8-bit sRGB colour of the
+chromaticity at Y = 1, as shown by the GUI. With ``--gamut`` two more
+columns report whether the chromaticity lies inside that gamut (0 or 1) and
+its xy distance to the gamut (0 inside).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+from pathlib import Path
+from typing import IO, Deque, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from color.gamut import Gamut, available_gamuts, get_gamut
+from color.space import XYZ_to_sRGB_array, XYZ_to_xy_array, xyY_to_XYZ_array
+from numerics.parallel import ParallelBatchExecutor, ShardTiming, calc_shard_XYZ
+from numerics.spectral import get_observer_integrator
+from utils import (
+    DEFAULT_OBSERVER,
+    available_observers,
+    iter_spectral_library,
+    load_color_matching_funcs,
+)
+
+OUTPUT_COLUMNS = ("X", "Y", "Z", "x", "y", "R", "G", "B")
+GAMUT_COLUMNS = ("in_gamut", "gamut_distance")
+INTEGER_COLUMNS = frozenset(("R", "G", "B", "in_gamut"))
+INPUT_FORMATS = ("csv", "npy", "raw", "jsonl")
+RAW_DTYPES = {"float32": "<f4", "float64": "<f8"}
+
+
+def detect_format(path: Path) -> str:
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("json", "ndjson"):
+        return "jsonl"
+    if suffix == "bin":
+        return "raw"
+    if suffix in INPUT_FORMATS:
+        return suffix
+    raise ValueError(f"Cannot infer the format of {path}; use --format")
+
+
+def _parse_csv_row(
+    row: Sequence[str], kind: str, header_allowed: bool
+) -> Optional[np.ndarray]:
+    try:
+        values = np.array([float(v) for v in row if v.strip()], dtype=float)
+    except ValueError:
+        # Only the first row may be a non-numeric header
+        if header_allowed:
+            return None
+        raise
+    if values.size == 0:
+        return None
+    if kind == "bezier":
+        if values.size % 2:
+            raise ValueError("Bézier rows need an even number of coordinates")
+        return values.reshape(-1, 2)
+    return values
+
+
+def _parse_json_record(line: str, kind: str) -> Optional[np.ndarray]:
+    if not line.strip():
+        return None
+    record = json.loads(line)
+    if isinstance(record, dict):
+        record = record["control_points" if kind == "bezier" else "spectrum"]
+    values = np.asarray(record, dtype=float)
+    return values.reshape(-1, 2) if kind == "bezier" else values.ravel()
+
+
+def iter_record_chunks(
+    path: Path,
+    fmt: str,
+    kind: str,
+    chunk_size: int,
+    record_length: Optional[int] = None,
+    dtype: str = "float64",
+) -> Iterator[List[np.ndarray] | np.ndarray]:
+    """Yield chunks of at most ``chunk_size`` records.
+
+    Spectra other than JSONL come from ``iter_spectral_library`` as
+    arrays; ``record_length`` and ``dtype`` describe raw input. Bézier NPY
+    input is memory-mapped and yields array slices; other text input is
+    read line by line and yields lists of per-record arrays.
+    """
+    if kind == "spectra" and fmt != "jsonl":
+        yield from iter_spectral_library(
+            path,
+            chunk_size,
+            "text" if fmt == "csv" else fmt,
+            record_length,
+            RAW_DTYPES[dtype],
+        )
+        return
+    if fmt == "raw":
+        raise ValueError("Raw input only holds spectra")
+    if fmt == "npy":
+        data = np.load(path, mmap_mode="r")
+        expected_ndim = 3 if kind == "bezier" else 2
+        if data.ndim != expected_ndim:
+            raise ValueError(f"Expected a {expected_ndim}-D array for {kind} input")
+        for start in range(0, len(data), chunk_size):
+            yield np.asarray(data[start : start + chunk_size], dtype=float)
+        return
+
+    with open(path, newline="") as f:
+        if fmt == "csv":
+            rows = (
+                row
+                for row in csv.reader(f)
+                if row and not row[0].lstrip().startswith("#")
+            )
+            records = (
+                _parse_csv_row(row, kind, header_allowed=i == 0)
+                for i, row in enumerate(rows)
+            )
+        else:
+            records = (_parse_json_record(line, kind) for line in f)
+        records = (r for r in records if r is not None)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def XYZ_to_output_rows(XYZ: np.ndarray, gamut: Optional[Gamut] = None) -> np.ndarray:
+    """Columns X, Y, Z, x, y, R, G, B for (B, 3) XYZ values, followed by
+    in_gamut and gamut_distance when ``gamut`` is given."""
+    xy = XYZ_to_xy_array(XYZ)
+    xyY = np.column_stack([xy, np.ones(len(xy))])
+    rgb = XYZ_to_sRGB_array(xyY_to_XYZ_array(xyY, out=xyY))
+    if gamut is None:
+        return np.column_stack([XYZ, xy, rgb])
+    _, distance = gamut.nearest_xy(xy)
+    return np.column_stack([XYZ, xy, rgb, distance == 0, distance])
+
+
+def output_columns(gamut: Optional[Gamut] = None) -> Tuple[str, ...]:
+    return OUTPUT_COLUMNS + GAMUT_COLUMNS if gamut is not None else OUTPUT_COLUMNS
+
+
+def write_rows(
+    out: IO[str], rows: np.ndarray, fmt: str, columns: Sequence[str] = OUTPUT_COLUMNS
+) -> None:
+    integer = [name in INTEGER_COLUMNS for name in columns]
+    for row in rows.tolist():
+        values = [int(v) if is_int else v for v, is_int in zip(row, integer)]
+        if fmt == "jsonl":
+            out.write(json.dumps(dict(zip(columns, values))) + "\n")
+        else:
+            out.write(",".join(repr(v) for v in values) + "\n")
+
+
+def run(args: argparse.Namespace) -> None:
+    input_path = Path(args.input)
+    fmt = args.format or detect_format(input_path)
+    if args.wavelength_range is not None and args.kind != "spectra":
+        raise ValueError("--wavelength-range only applies to spectra input")
+    if args.tolerance is not None and args.kind != "bezier":
+        raise ValueError("--tolerance only applies to bezier input")
+    output_fmt = "jsonl" if str(args.output).endswith((".jsonl", ".json")) else "csv"
+    gamut = get_gamut(args.gamut) if args.gamut is not None else None
+    columns = output_columns(gamut)
+
+    def write_XYZ(XYZ: np.ndarray) -> None:
+        write_rows(out, XYZ_to_output_rows(XYZ, gamut), output_fmt, columns)
+
+    def spectra_wavelengths(chunk) -> Optional[np.ndarray]:
+        if args.wavelength_range is None:
+            return None
+        start, stop = args.wavelength_range
+        return np.linspace(start, stop, np.shape(chunk[0])[-1])
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    executor = None
+    try:
+        if output_fmt == "csv":
+            out.write(",".join(columns) + "\n")
+        record_length = args.record_length
+        if fmt == "raw" and record_length is None:
+            if args.wavelength_range is not None:
+                raise ValueError(
+                    "Raw input with --wavelength-range needs --record-length"
+                )
+            record_length = len(load_color_matching_funcs(args.observer)[0])
+        chunks = iter_record_chunks(
+            input_path, fmt, args.kind, args.chunk_size, record_length, args.dtype
+        )
+        if args.workers == 1:
+            integrator = get_observer_integrator(args.observer)
+            for chunk in chunks:
+                XYZ = calc_shard_XYZ(
+                    integrator,
+                    chunk,
+                    args.kind,
+                    args.samples,
+                    spectra_wavelengths(chunk),
+                    args.tolerance,
+                )
+                write_XYZ(XYZ)
+            return
+
+        executor = ParallelBatchExecutor(
+            *load_color_matching_funcs(args.observer), workers=args.workers
+        )
+        # Bounded window of in-flight chunks keeps memory independent of
+        # the input size while preserving output order
+        pending: Deque[Tuple[int, int, Future]] = deque()
+        start = 0
+
+        def write_next() -> None:
+            index, first, future = pending.popleft()
+            XYZ, seconds, pid = future.result()
+            write_XYZ(XYZ)
+            if args.report_timings:
+                timing = ShardTiming(index, first, first + len(XYZ), seconds, pid)
+                print(timing, file=sys.stderr)
+
+        for index, chunk in enumerate(chunks):
+            future = executor.submit(
+                chunk,
+                args.kind,
+                args.samples,
+                spectra_wavelengths(chunk),
+                args.tolerance,
+            )
+            pending.append((index, start, future))
+            start += len(chunk)
+            if len(pending) >= 2 * args.workers:
+                write_next()
+        while pending:
+            write_next()
+    finally:
+        if executor is not None:
+            executor.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError("must be positive")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compute XYZ, xy and sRGB for Bézier curves or sampled spectra."
+    )
+    parser.add_argument("input", help="input file (.csv, .npy, .raw/.bin or .jsonl)")
+    parser.add_argument(
+        "-o", "--output", default="-", help="output .csv or .jsonl (default: stdout)"
+    )
+    parser.add_argument("--kind", choices=("bezier", "spectra"), default="bezier")
+    parser.add_argument("--format", choices=INPUT_FORMATS, help="input format")
+    parser.add_argument(
+        "--observer",
+        default=DEFAULT_OBSERVER,
+        choices=available_observers(),
+        help="CMF dataset (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--samples", type=positive_int, default=100, help="Bézier samples per curve"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=positive_float,
+        help="sample Bézier curves adaptively so X, Y and Z are within this "
+        "absolute error instead of using --samples (slower, opt-in)",
+    )
+    parser.add_argument(
+        "--gamut",
+        choices=available_gamuts(),
+        help="add in_gamut and gamut_distance columns for this RGB gamut",
+    )
+    parser.add_argument(
+        "--wavelength-range",
+        type=float,
+        nargs=2,
+        metavar=("START", "STOP"),
+        help="uniform wavelength grid (nm) of sampled spectra",
+    )
+    parser.add_argument(
+        "--record-length",
+        type=positive_int,
+        help="values per spectrum in raw input (default: the observer's grid "
+        "length)",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=tuple(RAW_DTYPES),
+        default="float64",
+        help="value type of raw input (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=positive_int, default=10000, help="records per chunk"
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="worker processes; more than 1 uses a process pool",
+    )
+    parser.add_argument(
+        "--report-timings",
+        action="store_true",
+        help="print per-chunk timing to stderr (with --workers > 1)",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        run(args)
+    except (OSError, ValueError, KeyError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
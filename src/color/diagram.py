@@ -0,0 +1,111 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils import DEFAULT_OBSERVER
+
+from .locus import LOCUS_MAX_WAVELENGTH, get_spectral_locus
+from .space import XYZ_TO_LINEAR_SRGB, SRGBEncoder, get_srgb_encoder
+
+
+def pixel_centers(
+    size: int, value_range: Tuple[float, float], reverse: bool = False
+) -> np.ndarray:
+    """Coordinates of ``size`` pixel centres spanning ``value_range``."""
+    start, stop = value_range
+    centers = start + (np.arange(size) + 0.5) * ((stop - start) / size)
+    return centers[::-1] if reverse else centers
+
+
+def polygon_mask(polygon: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Even-odd fill of a closed polygon sampled at grid points.
+
+    Scanline rasterization: every row of ``y`` is intersected with all
+    edges at once, the crossings toggle a per-row counter at their column,
+    and a cumulative sum along the row tells which points are inside.
+
+    Parameters
+    ----------
+    polygon : np.ndarray
+        Vertices of shape (V, 2); the last vertex connects to the first.
+    x, y : np.ndarray
+        Increasing column coordinates (W,) and row coordinates (H,).
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of shape (H, W).
+    """
+    polygon = np.asarray(polygon, dtype=float)
+    start = polygon
+    end = np.roll(polygon, -1, axis=0)
+    row_y = np.asarray(y, dtype=float)[:, None]
+    # Half-open rule so vertices shared by two edges count once
+    crosses = (start[:, 1] <= row_y) != (end[:, 1] <= row_y)
+    rows, edges = np.nonzero(crosses)
+    fraction = (row_y[rows, 0] - start[edges, 1]) / (end[edges, 1] - start[edges, 1])
+    crossing_x = start[edges, 0] + fraction * (end[edges, 0] - start[edges, 0])
+    columns = np.searchsorted(x, crossing_x)
+
+    width = len(x)
+    toggles = np.bincount(
+        rows * (width + 1) + columns, minlength=len(row_y) * (width + 1)
+    ).reshape(len(row_y), width + 1)
+    return (np.cumsum(toggles[:, :width], axis=1) % 2).astype(bool)
+
+
+def rasterize_chromaticity_diagram(
+    width: int,
+    height: int,
+    x_range: Tuple[float, float] = (0.0, 0.8),
+    y_range: Tuple[float, float] = (0.0, 0.9),
+    observer: str = DEFAULT_OBSERVER,
+    encoder: Optional[SRGBEncoder] = None,
+    max_wavelength: Optional[float] = LOCUS_MAX_WAVELENGTH,
+) -> np.ndarray:
+    """Render the full-colour chromaticity diagram as an RGBA image.
+
+    Every pixel inside the spectral locus (closed by the purple line) gets
+    the sRGB colour of its chromaticity, scaled to the brightest colour of
+    that hue: out-of-gamut linear components are clipped at 0 and the
+    result is divided by its largest component. Pixels outside are fully
+    transparent. Gamma encoding uses ``encoder`` (default: the shared
+    4096-entry table).
+
+    Parameters
+    ----------
+    x_range, y_range : Tuple[float, float]
+        Chromaticity extent of the image; row 0 is the top (largest y).
+    max_wavelength : float, optional
+        Longest wavelength (nm) of the locus closed by the purple line.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (height, width, 4) with 8-bit RGBA values.
+    """
+    if width < 1 or height < 1:
+        raise ValueError("Image size must be at least 1×1")
+    encoder = encoder or get_srgb_encoder()
+    x = pixel_centers(width, x_range)
+    y = pixel_centers(height, y_range, reverse=True)
+    locus = get_spectral_locus(observer, max_wavelength=max_wavelength)
+    inside = polygon_mask(locus.xy, x, y)
+
+    # With Y = 1, X = x / y and Z = (1 − x) / y − 1, so every linear sRGB
+    # channel is an outer product a(x) / y + b over the pixel grid
+    inverse_y = np.divide(1.0, y, out=np.zeros_like(y), where=y > 0)
+    linear = np.empty((3, height, width), dtype=float)
+    for c, (m_x, m_y, m_z) in enumerate(XYZ_TO_LINEAR_SRGB):
+        np.multiply.outer(inverse_y, m_x * x + m_z * (1.0 - x), out=linear[c])
+        linear[c] += m_y - m_z
+    np.maximum(linear, 0.0, out=linear)
+    peak = linear.max(axis=0)
+    np.divide(linear, peak, out=linear, where=peak > 0)
+
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+    image[..., :3] = np.moveaxis(encoder.encode_8bit(linear), 0, -1)
+    image[..., 3] = 255
+    # Transparent pixels stay black so premultiplied consumers agree
+    image[~inside] = 0
+    return image
@@ -0,0 +1,257 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .space import XYZ_to_xy_array
+
+# CIE 1931 chromaticity of the D65 white point
+D65_WHITE = (0.3127, 0.3290)
+
+MAPPING_METHODS = ("clip", "desaturate", "nearest")
+
+
+class Gamut:
+    """Additive RGB gamut spanned by three primaries.
+
+    Membership of chromaticities uses the three edge half-planes of the
+    primaries' triangle, precomputed as unit inward normals and offsets, so
+    a batch of N points costs one fused pass per edge. Membership of
+    tristimulus values uses the gamut's XYZ → linear RGB matrix, derived
+    from the primaries and the white point.
+
+    Parameters
+    ----------
+    primaries : Sequence[Tuple[float, float]]
+        Chromaticities (x, y) of the red, green and blue primaries.
+    white : Tuple[float, float]
+        Chromaticity of the white point, RGB = (1, 1, 1) at Y = 1.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        primaries: Sequence[Tuple[float, float]],
+        white: Tuple[float, float] = D65_WHITE,
+    ) -> None:
+        self.name = name
+        self.primaries = np.array(primaries, dtype=float)
+        if self.primaries.shape != (3, 2):
+            raise ValueError("A gamut needs three (x, y) primaries")
+        self.white = np.array(white, dtype=float)
+
+        start = self.primaries
+        end = np.roll(start, -1, axis=0)
+        edges = end - start
+        area = edges[0, 0] * edges[1, 1] - edges[0, 1] * edges[1, 0]
+        if area == 0:
+            raise ValueError("Gamut primaries are collinear")
+        # Rotating an edge by −90° (counter-clockwise triangle) points inwards
+        normals = np.column_stack([-edges[:, 1], edges[:, 0]]) * np.sign(area)
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        self.edge_starts = start
+        self.edges = edges
+        self.edge_normals = normals
+        self.edge_offsets = -np.einsum("ij,ij->i", normals, start)
+
+        # Columns are the primaries' XYZ at Y = 1, scaled so they sum to white
+        x, y = self.primaries.T
+        primaries_XYZ = np.array([x / y, np.ones(3), (1 - x - y) / y])
+        white_XYZ = np.array(
+            [self.white[0] / self.white[1], 1.0, (1 - self.white.sum()) / self.white[1]]
+        )
+        scale = np.linalg.solve(primaries_XYZ, white_XYZ)
+        self.linear_rgb_to_XYZ = primaries_XYZ * scale
+        self.XYZ_to_linear_rgb = np.linalg.inv(self.linear_rgb_to_XYZ)
+        for array in (
+            self.primaries,
+            self.white,
+            self.edge_starts,
+            self.edges,
+            self.edge_normals,
+            self.edge_offsets,
+            self.linear_rgb_to_XYZ,
+            self.XYZ_to_linear_rgb,
+        ):
+            array.setflags(write=False)
+
+    def __repr__(self) -> str:
+        return f"Gamut({self.name!r})"
+
+    def edge_distances(self, xy: np.ndarray) -> np.ndarray:
+        """Signed distances (..., 3) of chromaticities to the edge lines,
+        positive on the inner side."""
+        xy = np.asarray(xy, dtype=float)
+        return xy @ self.edge_normals.T + self.edge_offsets
+
+    def contains_xy(self, xy: np.ndarray, tolerance: float = 0.0) -> np.ndarray:
+        """Whether (..., 2) chromaticities lie inside the primaries' triangle,
+        up to ``tolerance`` outside it."""
+        xy = np.asarray(xy, dtype=float)
+        x, y = xy[..., 0], xy[..., 1]
+        # One fused pass per edge over the x and y columns is several times
+        # faster than a (N, 2) × (2, 3) product with so few columns
+        inside = np.ones(xy.shape[:-1], dtype=bool)
+        for (nx, ny), offset in zip(
+            self.edge_normals.tolist(), self.edge_offsets.tolist()
+        ):
+            distance = x * nx
+            distance += y * ny
+            inside &= distance >= -(offset + tolerance)
+        return inside
+
+    def XYZ_to_rgb(self, XYZ: np.ndarray) -> np.ndarray:
+        """Linear RGB (..., 3) of the gamut's primaries, unclipped."""
+        return np.asarray(XYZ, dtype=float) @ self.XYZ_to_linear_rgb.T
+
+    def rgb_to_XYZ(self, rgb: np.ndarray) -> np.ndarray:
+        return np.asarray(rgb, dtype=float) @ self.linear_rgb_to_XYZ.T
+
+    def contains_XYZ(self, XYZ: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+        """Whether (..., 3) XYZ values have linear RGB within [0, 1].
+
+        Unlike ``contains_xy`` this also rejects colours brighter than the
+        gamut can reproduce at their chromaticity.
+        """
+        rgb = self.XYZ_to_rgb(XYZ)
+        return (_component_min(rgb) >= -tolerance) & (
+            _component_max(rgb) <= 1 + tolerance
+        )
+
+    def nearest_xy(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Closest in-gamut chromaticities and their distances to ``xy``.
+
+        Points inside are returned unchanged with distance 0; points outside
+        are projected onto the nearest triangle edge.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Chromaticities of shape (..., 2) and distances of shape (...).
+        """
+        xy = np.asarray(xy, dtype=float)
+        x, y = xy[..., 0], xy[..., 1]
+        best_sq = np.full(x.shape, np.inf)
+        nearest_x = np.empty(x.shape)
+        nearest_y = np.empty(x.shape)
+        # Projection onto each edge segment, clamped to its end points
+        for (start_x, start_y), (edge_x, edge_y) in zip(
+            self.edge_starts.tolist(), self.edges.tolist()
+        ):
+            dx = x - start_x
+            dy = y - start_y
+            t = dx * edge_x
+            t += dy * edge_y
+            t *= 1.0 / (edge_x * edge_x + edge_y * edge_y)
+            t = np.clip(t, 0.0, 1.0)
+            dx -= t * edge_x
+            dy -= t * edge_y
+            distance_sq = dx * dx
+            distance_sq += dy * dy
+            closer = distance_sq < best_sq
+            np.copyto(best_sq, distance_sq, where=closer)
+            np.copyto(nearest_x, x - dx, where=closer)
+            np.copyto(nearest_y, y - dy, where=closer)
+
+        inside = self.contains_xy(xy)
+        best_sq[inside] = 0.0
+        nearest = np.stack([nearest_x, nearest_y], axis=-1)
+        nearest[inside] = xy[inside]
+        return nearest, np.sqrt(best_sq)
+
+    def distance_xy(self, xy: np.ndarray) -> np.ndarray:
+        """Euclidean xy distance of chromaticities to the gamut, 0 inside."""
+        return self.nearest_xy(xy)[1]
+
+    def map_XYZ(self, XYZ: np.ndarray, method: str = "clip") -> np.ndarray:
+        """Map (..., 3) XYZ values into the gamut.
+
+        Methods
+        -------
+        clip
+            Clamp each linear RGB component to [0, 1]; cheap, but shifts hue.
+        desaturate
+            Move the chromaticity towards the white point at constant Y
+            until it is inside, then dim colours that are too bright.
+        nearest
+            Replace the chromaticity by the closest in-gamut one at constant
+            Y, then dim colours that are too bright.
+
+        Colours already inside are returned unchanged by every method, and
+        every method maps non-positive Y to black.
+        """
+        if method not in MAPPING_METHODS:
+            raise ValueError(
+                f"Unknown gamut mapping {method!r}; "
+                f"available: {', '.join(MAPPING_METHODS)}"
+            )
+        XYZ = np.asarray(XYZ, dtype=float)
+        rgb = self.XYZ_to_rgb(XYZ)
+        Y = np.maximum(XYZ[..., 1:2], 0.0)
+        if method == "clip":
+            np.clip(rgb, 0.0, 1.0, out=rgb)
+        elif method == "desaturate":
+            # White of the same luminance is RGB = (Y, Y, Y); the mix
+            # Y + s·(rgb − Y) keeps Y and moves xy straight towards white,
+            # and s = Y / (Y − min(rgb)) puts the smallest component at 0
+            lowest = _component_min(rgb)
+            saturation = np.ones_like(lowest)
+            np.divide(Y[..., 0], Y[..., 0] - lowest, out=saturation, where=lowest < 0)
+            rgb -= Y
+            rgb *= saturation[..., None]
+            rgb += Y
+        else:
+            x, y = np.moveaxis(self.nearest_xy(XYZ_to_xy_array(XYZ))[0], -1, 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.where(y > 0, Y[..., 0] / y, 0.0)
+            mapped = np.stack([x * scale, Y[..., 0], (1 - x - y) * scale], axis=-1)
+            rgb = np.maximum(self.XYZ_to_rgb(mapped), 0.0)
+
+        # Components above 1 are brought back by dimming the whole colour
+        peak = np.maximum(_component_max(rgb), 1.0)
+        rgb /= peak[..., None]
+        rgb[Y[..., 0] <= 0] = 0.0
+        return self.rgb_to_XYZ(rgb)
+
+
+def _component_min(values: np.ndarray) -> np.ndarray:
+    # Elementwise over the three columns; a reduction along a length-3 axis
+    # is several times slower
+    return np.minimum(np.minimum(values[..., 0], values[..., 1]), values[..., 2])
+
+
+def _component_max(values: np.ndarray) -> np.ndarray:
+    return np.maximum(np.maximum(values[..., 0], values[..., 1]), values[..., 2])
+
+
+_gamuts: Dict[str, Gamut] = {}
+
+
+def register_gamut(
+    name: str,
+    primaries: Sequence[Tuple[float, float]],
+    white: Tuple[float, float] = D65_WHITE,
+    replace: bool = False,
+) -> Gamut:
+    """Make an RGB gamut selectable by ``name``."""
+    if name in _gamuts and not replace:
+        raise ValueError(f"Gamut already registered: {name}")
+    gamut = Gamut(name, primaries, white)
+    _gamuts[name] = gamut
+    return gamut
+
+
+def get_gamut(name: str = "sRGB") -> Gamut:
+    try:
+        return _gamuts[name]
+    except KeyError:
+        available = ", ".join(available_gamuts())
+        raise KeyError(f"Unknown gamut {name!r}; available: {available}") from None
+
+
+def available_gamuts() -> List[str]:
+    return list(_gamuts)
+
+
+register_gamut("sRGB", [(0.64, 0.33), (0.30, 0.60), (0.15, 0.06)])
+register_gamut("Display P3", [(0.680, 0.320), (0.265, 0.690), (0.150, 0.060)])
+register_gamut("Rec.2020", [(0.708, 0.292), (0.170, 0.797), (0.131, 0.046)])
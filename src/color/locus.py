@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from utils import DEFAULT_OBSERVER, load_color_matching_funcs
+
+from .space import XYZ_to_sRGB_array, XYZ_to_xy_array, xyY_to_XYZ_array
+
+# Above this wavelength (nm) the 4-decimal CMF tables are too coarse for
+# stable chromaticities and the locus wanders off towards x = 1
+LOCUS_MAX_WAVELENGTH = 700.0
+
+
+class SpectralLocus(NamedTuple):
+    """Spectral locus sampled at ``wavelengths`` (nm).
+
+    ``xy`` holds chromaticities with shape (N, 2) and ``rgb`` the 8-bit sRGB
+    color of each chromaticity at Y = 1 with shape (N, 3).
+    """
+
+    wavelengths: np.ndarray
+    xy: np.ndarray
+    rgb: np.ndarray
+
+
+def calc_spectral_locus(
+    wavelengths: np.ndarray,
+    cmfs_values: np.ndarray,
+    min_wavelength: Optional[float] = None,
+    max_wavelength: Optional[float] = None,
+    step: Optional[float] = None,
+) -> SpectralLocus:
+    """Compute the spectral locus of a CMF table in one vectorized pass.
+
+    Parameters
+    ----------
+    min_wavelength, max_wavelength : float, optional
+        Wavelength range (nm); defaults to the table's range.
+    step : float, optional
+        Wavelength resolution (nm); CMFs are linearly interpolated onto it.
+        Defaults to the table's own samples.
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    cmfs_values = np.asarray(cmfs_values, dtype=float)
+    lo = wavelengths[0] if min_wavelength is None else min_wavelength
+    hi = wavelengths[-1] if max_wavelength is None else max_wavelength
+    if step is None:
+        mask = (wavelengths >= lo) & (wavelengths <= hi)
+        locus_wavelengths = wavelengths[mask]
+        XYZ = cmfs_values[mask]
+    else:
+        locus_wavelengths = np.arange(lo, hi + step / 2, step)
+        XYZ = np.column_stack(
+            [
+                np.interp(locus_wavelengths, wavelengths, cmfs_values[:, i])
+                for i in range(3)
+            ]
+        )
+
+    # Wavelengths where all CMFs vanish have no chromaticity
+    visible = XYZ.sum(axis=1) > 0
+    locus_wavelengths = locus_wavelengths[visible]
+    xy = XYZ_to_xy_array(XYZ[visible])
+    xyY = np.column_stack([xy, np.ones(len(xy))])
+    rgb = XYZ_to_sRGB_array(xyY_to_XYZ_array(xyY, out=xyY))
+    for array in (locus_wavelengths, xy, rgb):
+        array.setflags(write=False)
+    return SpectralLocus(locus_wavelengths, xy, rgb)
+
+
+@lru_cache(maxsize=32)
+def get_spectral_locus(
+    observer: str = DEFAULT_OBSERVER,
+    min_wavelength: Optional[float] = None,
+    max_wavelength: Optional[float] = None,
+    step: Optional[float] = None,
+) -> SpectralLocus:
+    """Spectral locus of a registered observer, cached per observer and range."""
+    wavelengths, cmfs_values = load_color_matching_funcs(observer)
+    return calc_spectral_locus(
+        wavelengths, cmfs_values, min_wavelength, max_wavelength, step
+    )
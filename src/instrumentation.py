@@ -0,0 +1,191 @@
+"""Low-overhead timers and counters for the GUI pipeline.
+
+Instrumentation is off unless one of these environment variables is set:
+
+``GK1_PROFILE=1``
+    Collect named timers and counters (``profiler.stats()``).
+``GK1_PROFILE_OVERLAY=1``
+    Also draw frame and compute times on top of the spectral widget.
+``GK1_TRACE=<path>``
+    Also record every timed event and write them as Chrome trace-event JSON
+    to ``path`` at exit (open with chrome://tracing or Perfetto).
+
+When disabled, ``profiler.timer`` returns a shared no-op context manager
+and ``profiler.count`` returns immediately.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+ENV_PROFILE = "GK1_PROFILE"
+ENV_OVERLAY = "GK1_PROFILE_OVERLAY"
+ENV_TRACE = "GK1_TRACE"
+
+# Oldest trace events are dropped beyond this count to bound memory
+MAX_TRACE_EVENTS = 1_000_000
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class TimerStats:
+    __slots__ = ("count", "total_ms", "last_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_ms: float = 0.0
+        self.last_ms: float = 0.0
+        self.max_ms: float = 0.0
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.last_ms = duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def as_dict(self) -> Dict[str, float]:
+        mean_ms = self.total_ms / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": mean_ms,
+            "last_ms": self.last_ms,
+            "max_ms": self.max_ms,
+        }
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start_ns")
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start_ns = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler._record(self.name, self.start_ns, time.perf_counter_ns())
+
+
+class Profiler:
+    """Named timers and counters with optional Chrome trace recording."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        overlay: bool = False,
+        trace_path: Optional[str] = None,
+    ) -> None:
+        self.enabled = enabled or overlay or trace_path is not None
+        self.overlay = overlay
+        self.trace_path = trace_path
+        self._timers: Dict[str, TimerStats] = {}
+        self._counters: Dict[str, int] = {}
+        self._events: Deque[dict] = deque(maxlen=MAX_TRACE_EVENTS)
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    @classmethod
+    def from_env(cls) -> Profiler:
+        return cls(
+            enabled=os.environ.get(ENV_PROFILE, "") not in ("", "0"),
+            overlay=os.environ.get(ENV_OVERLAY, "") not in ("", "0"),
+            trace_path=os.environ.get(ENV_TRACE) or None,
+        )
+
+    def timer(self, name: str):
+        """Context manager timing the enclosed block under ``name``."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            value = self._counters.get(name, 0) + n
+            self._counters[name] = value
+            if self.trace_path is not None:
+                self._events.append(
+                    {
+                        "name": name,
+                        "ph": "C",
+                        "ts": self._timestamp_us(time.perf_counter_ns()),
+                        "pid": self._pid,
+                        "args": {name: value},
+                    }
+                )
+
+    def last_ms(self, name: str) -> float:
+        stats = self._timers.get(name)
+        return stats.last_ms if stats is not None else 0.0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "timers": {k: v.as_dict() for k, v in self._timers.items()},
+                "counters": dict(self._counters),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self._events.clear()
+
+    def dump_trace(self, path: Optional[str] = None) -> None:
+        """Write recorded events as Chrome trace-event JSON."""
+        path = path or self.trace_path
+        if path is None:
+            return
+        with self._lock:
+            events = list(self._events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def _timestamp_us(self, ns: int) -> float:
+        return (ns - self._origin_ns) / 1e3
+
+    def _record(self, name: str, start_ns: int, end_ns: int) -> None:
+        duration_ms = (end_ns - start_ns) / 1e6
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = TimerStats()
+            stats.add(duration_ms)
+            if self.trace_path is not None:
+                self._events.append(
+                    {
+                        "name": name,
+                        "ph": "X",
+                        "ts": self._timestamp_us(start_ns),
+                        "dur": (end_ns - start_ns) / 1e3,
+                        "pid": self._pid,
+                        "tid": threading.get_ident(),
+                    }
+                )
+
+
+profiler = Profiler.from_env()
+
+if profiler.trace_path is not None:
+    atexit.register(profiler.dump_trace)
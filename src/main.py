@@ -3,6 +3,7 @@ from typing import List, Tuple
 
 from PySide6.QtWidgets import QApplication, QMainWindow
 
+from instrumentation import profiler
 from ui.mainwindow_ui import Ui_MainWindow
 
 
@@ -26,15 +27,17 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.spectralDistributionWidget.XYZChanged.connect(self.update_XYZ_labels)
 
     def update_color_label(self, rgb: Tuple[int, int, int]) -> None:
-        self.colorLabel.setStyleSheet(
-            f"background-color: rgb({rgb[0]}, {rgb[1]}, {rgb[2]}); border: 1px solid black;"
-        )
+        with profiler.timer("main.update_color_label"):
+            self.colorLabel.setStyleSheet(
+                f"background-color: rgb({rgb[0]}, {rgb[1]}, {rgb[2]}); border: 1px solid black;"
+            )
 
     def update_XYZ_labels(self, XYZ: List[float]) -> None:
-        x, y, z = (float(XYZ[0]), float(XYZ[1]), float(XYZ[2]))
-        self.XLabel.setText(f"X:  {x:.3f}")
-        self.YLabel.setText(f"Y:  {y:.3f}")
-        self.ZLabel.setText(f"Z:  {z:.3f}")
+        with profiler.timer("main.update_XYZ_labels"):
+            x, y, z = (float(XYZ[0]), float(XYZ[1]), float(XYZ[2]))
+            self.XLabel.setText(f"X:  {x:.3f}")
+            self.YLabel.setText(f"Y:  {y:.3f}")
+            self.ZLabel.setText(f"Z:  {z:.3f}")
 
 
 if __name__ == "__main__":
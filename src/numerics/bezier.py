@@ -1,4 +1,9 @@
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .control_points import ControlPointStore
 
 
 def de_casteljau(
@@ -22,6 +27,287 @@ def de_casteljau(
     return points[0]
 
 
+def bernstein_basis(n: int, t: np.ndarray) -> np.ndarray:
+    """Evaluate all ``n`` Bernstein polynomials of degree ``n − 1`` at ``t``.
+
+    The basis is built with the de Casteljau-style recurrence
+    B⁽ʳ⁾ = [(1−t)·B⁽ʳ⁻¹⁾, 0] + [0, t·B⁽ʳ⁻¹⁾], which only ever combines
+    non-negative terms and therefore stays stable for large control point
+    counts where explicit binomial coefficients would overflow.
+
+    Returns
+    -------
+    np.ndarray
+        Matrix of shape (len(t), n) whose row k holds the weights of every
+        control point at t[k].
+    """
+    t = np.asarray(t, dtype=float).reshape(-1, 1)
+    basis = np.zeros((t.shape[0], max(n, 0)), dtype=float)
+    if n == 0:
+        return basis
+    s = 1.0 - t
+    basis[:, :1] = 1.0
+    for r in range(1, n):
+        # Update from the right so every step reads the previous row values
+        basis[:, r : r + 1] = t * basis[:, r - 1 : r]
+        basis[:, 1:r] = s * basis[:, 1:r] + t * basis[:, 0 : r - 1]
+        basis[:, :1] *= s
+    return basis
+
+
+@lru_cache(maxsize=64)
+def uniform_bernstein_basis(n: int, samples: int) -> np.ndarray:
+    """Read-only Bernstein matrix for ``samples`` uniform t values in [0,1].
+
+    Cached per (n, samples) since the spectral pipeline and the widget
+    evaluate curves on the same uniform grid on every update.
+    """
+    basis = bernstein_basis(n, np.linspace(0.0, 1.0, samples))
+    basis.setflags(write=False)
+    return basis
+
+
+def eval_bezier(control_points: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Evaluate Bézier curves at the parameters ``t`` in one batched pass.
+
+    Parameters
+    ----------
+    control_points : np.ndarray
+        Control points of shape (n, 2), or a stack of curves with shape
+        (..., n, 2) sharing the same control point count.
+    t : np.ndarray
+        Curve parameters in [0,1].
+
+    Returns
+    -------
+    np.ndarray
+        Curve points of shape (..., len(t), 2).
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    basis = bernstein_basis(control_points.shape[-2], t)
+    return np.matmul(basis, control_points)
+
+
+def sample_bezier(control_points: np.ndarray, samples: int) -> np.ndarray:
+    """Sample Bézier curves uniformly in t ∈ [0,1].
+
+    Vectorized counterpart of ``eval_bezier_curve`` accepting (n, 2) or
+    (..., n, 2) control point arrays and returning (..., samples, 2).
+    """
+    if samples < 2:
+        raise ValueError("Samples must be at least 2")
+    control_points = np.asarray(control_points, dtype=float)
+    basis = uniform_bernstein_basis(control_points.shape[-2], samples)
+    return np.matmul(basis, control_points)
+
+
+def de_casteljau_eval(
+    coefficients: np.ndarray, t: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate scalar Bézier functions and their derivatives at ``t``.
+
+    Parameters
+    ----------
+    coefficients : np.ndarray
+        Bézier coefficients of shape (..., n), e.g. the x coordinates of the
+        control points.
+    t : np.ndarray
+        Parameters of shape (..., M), one row per function.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Values and derivatives d/dt, both of shape (..., M).
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    t = np.asarray(t, dtype=float)
+    n = coefficients.shape[-1]
+    if n < 2:
+        value = np.zeros(np.broadcast_shapes(coefficients.shape[:-1] + (1,), t.shape))
+        if n == 1:
+            value += coefficients[..., :1]
+        return value, np.zeros_like(value)
+    # Coefficients along axis -2 so every level works on whole rows of t
+    return _de_casteljau_levels(coefficients[..., :, None], t[..., None, :])
+
+
+def _de_casteljau_levels(
+    points: np.ndarray, t: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run de Casteljau on coefficients stacked along axis -2.
+
+    ``t`` has a length-1 axis -2 and broadcasts against ``points``; at
+    least two coefficients are required.
+    """
+    n = points.shape[-2]
+    # Stop one level early: the last two points give the derivative
+    for _ in range(n - 2):
+        lower = points[..., :-1, :]
+        points = lower + t * (points[..., 1:, :] - lower)
+    left = points[..., 0, :]
+    difference = points[..., 1, :] - left
+    return left + t[..., 0, :] * difference, (n - 1) * difference
+
+
+def interp_rows(
+    grid: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    left: float = 0.0,
+    right: float = 0.0,
+) -> np.ndarray:
+    """Linearly interpolate many monotone curves onto one shared grid.
+
+    Batched equivalent of ``np.interp(grid, x[b], y[b], left, right)``
+    for every row b. Samples are located on the grid with one
+    ``searchsorted``; a per-row cumulative count then gives the segment
+    index of every grid point, so no Python loop runs over the rows.
+
+    Parameters
+    ----------
+    grid : np.ndarray
+        Increasing query points of shape (N,).
+    x, y : np.ndarray
+        Curve samples of shape (B, M) with each row of ``x`` non-decreasing.
+    left, right : float
+        Values returned below and above each row's support.
+
+    Returns
+    -------
+    np.ndarray
+        Interpolated values of shape (B, N).
+    """
+    grid = np.asarray(grid, dtype=float)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rows, m = x.shape
+    n = grid.size
+    if rows == 0 or m < 2:
+        return np.full((rows, n), left, dtype=float)
+
+    # segment[b, j] = #{k : x[b, k] <= grid[j]} - 1, clamped to valid segments
+    pos = np.searchsorted(grid, x, side="left")
+    pos += np.arange(rows)[:, None] * (n + 1)
+    counts = np.bincount(pos.ravel(), minlength=rows * (n + 1))
+    segment = np.cumsum(counts.reshape(rows, n + 1)[:, :n], axis=1)
+    np.clip(segment, 1, m - 1, out=segment)
+    segment -= 1
+
+    dx = np.diff(x, axis=1)
+    dy = np.diff(y, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(dx > 0, dy / dx, 0.0)
+    intercept = y[:, :-1] - slope * x[:, :-1]
+    values = np.take_along_axis(slope, segment, axis=1)
+    values *= grid
+    values += np.take_along_axis(intercept, segment, axis=1)
+    values[grid < x[:, :1]] = left
+    values[grid > x[:, -1:]] = right
+    return values
+
+
+# Uniform samples bracketing the targets of solve_bezier_x
+BRACKET_SAMPLES = 256
+_BRACKET_T = np.linspace(0.0, 1.0, BRACKET_SAMPLES)
+_BRACKET_T.setflags(write=False)
+
+
+def solve_bezier_x(
+    control_points: np.ndarray,
+    x: np.ndarray,
+    tolerance: float = 1e-12,
+    max_iterations: int = 50,
+) -> np.ndarray:
+    """Solve x(t) = x for every target on x-monotone Bézier curves.
+
+    Each target is first bracketed between two uniform curve samples
+    and linearly interpolated within them. Newton steps then refine t,
+    falling back to bisection whenever a step leaves the bracket, so the
+    iteration converges even where x'(t) vanishes. Targets outside the
+    curve's x range map to t = 0 or 1.
+
+    Parameters
+    ----------
+    control_points : np.ndarray
+        Control points of shape (n, 2) or (B, n, 2) with non-decreasing x.
+    x : np.ndarray
+        Increasing targets of shape (M,).
+
+    Returns
+    -------
+    np.ndarray
+        Parameters t of shape (M,) or (B, M).
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    x = np.asarray(x, dtype=float)
+    coefficients = control_points[..., 0]
+    curve_x = sample_bezier(control_points, BRACKET_SAMPLES)[..., 0]
+    intervals = BRACKET_SAMPLES - 1
+
+    # Linear interpolation between the uniform samples gives the initial t;
+    # the samples around it bracket the root since x(t) is monotone
+    samples = curve_x.reshape(-1, BRACKET_SAMPLES)
+    t = interp_rows(
+        x, samples, np.broadcast_to(_BRACKET_T, samples.shape), left=0.0, right=1.0
+    )
+    # Iterate only on targets still unresolved; those clamped to an end of
+    # the curve cannot improve
+    index, column = np.nonzero((t > 0.0) & (t < 1.0))
+    # One column per curve so gathered targets keep every level contiguous
+    columns = np.ascontiguousarray(coefficients.reshape(-1, coefficients.shape[-1]).T)
+    if columns.shape[0] < 2:
+        # A single control point has constant x; any t solves it
+        index, column = index[:0], column[:0]
+    current = t[index, column]
+    lo = np.minimum(np.floor(current * intervals), intervals - 1) / intervals
+    hi = lo + 1.0 / intervals
+    for _ in range(max_iterations):
+        if not index.size:
+            break
+        value, slope = _de_casteljau_levels(columns[:, index], current[None, :])
+        residual = value - x[column]
+        active = np.abs(residual) > tolerance
+        if not active.all():
+            t[index, column] = current
+            index, column = index[active], column[active]
+            current, lo, hi = current[active], lo[active], hi[active]
+            residual, slope = residual[active], slope[active]
+        below = residual < 0
+        lo = np.where(below, current, lo)
+        hi = np.where(below, hi, current)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = current - residual / slope
+        bisect = ~((step > lo) & (step < hi))
+        current = np.where(bisect, 0.5 * (lo + hi), step)
+    t[index, column] = current
+    return t.reshape(curve_x.shape[:-1] + x.shape)
+
+
+def split_bezier(
+    control_points: np.ndarray, t: float = 0.5
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Split Bézier curves at ``t`` with de Casteljau's algorithm.
+
+    Accepts (n, 2) or (..., n, 2) control points and returns the control
+    points of the [0, t] and [t, 1] pieces, each with the input's shape.
+    """
+    points = np.array(control_points, dtype=float)
+    n = points.shape[-2]
+    left = np.empty_like(points)
+    right = np.empty_like(points)
+    if n == 0:
+        return left, right
+    left[..., 0, :] = points[..., 0, :]
+    right[..., n - 1, :] = points[..., n - 1, :]
+    for r in range(1, n):
+        lower = points[..., : n - r, :]
+        upper = points[..., 1 : n - r + 1, :]
+        points[..., : n - r, :] = (1 - t) * lower + t * upper
+        left[..., r, :] = points[..., 0, :]
+        right[..., n - 1 - r, :] = points[..., n - 1 - r, :]
+    return left, right
+
+
 def eval_bezier_curve(
     control_points: List[Tuple[float, float]], samples: int
 ) -> List[Tuple[float, float]]:
@@ -34,6 +320,121 @@ def eval_bezier_curve(
     samples : int
         Number of uniformly spaced samples; must be ≥ 2.
     """
-    if samples < 2:
-        raise ValueError("Samples must be at least 2")
-    return [de_casteljau(control_points, t / (samples - 1)) for t in range(samples)]
+    curve = sample_bezier(
+        np.asarray(control_points, dtype=float).reshape(-1, 2), samples
+    )
+    return [(float(x), float(y)) for x, y in curve]
+
+
+class IncrementalBezier:
+    """Uniformly sampled Bézier curve updated point by point.
+
+    A curve is linear in its control points, C = B · P, so moving point i by
+    Δ changes the samples by the outer product B[:, i] ⊗ Δ. ``update`` diffs
+    new control points against the current ones and applies that O(samples)
+    delta when a single point moved, falling back to a full evaluation
+    otherwise. The curve is re-evaluated from scratch after
+    ``refresh_interval`` consecutive deltas to bound floating-point drift.
+    ``sync`` does the same for a ``ControlPointStore`` without diffing, by
+    reading its version stamps, and allocates nothing for a single move.
+    """
+
+    def __init__(self, samples: int = 100, refresh_interval: int = 256) -> None:
+        if samples < 2:
+            raise ValueError("Samples must be at least 2")
+        self.samples = samples
+        self.refresh_interval = refresh_interval
+        self.control_points: List[Tuple[float, float]] = []
+        self.basis = uniform_bernstein_basis(0, samples)
+        self._curve = np.zeros((samples, 2), dtype=float)
+        # Strided views of the sample coordinates
+        self.x = self._curve[:, 0]
+        self.y = self._curve[:, 1]
+        self._curve_view = self._curve.view()
+        self._curve_view.setflags(write=False)
+        self._scratch = np.empty(samples, dtype=float)
+        self._deltas: int = 0
+        # Store and version the samples were last synced to
+        self._synced_store: Optional[ControlPointStore] = None
+        self._synced_version: int = -1
+
+    @property
+    def curve(self) -> np.ndarray:
+        """Read-only view of the current samples, shape (samples, 2)."""
+        return self._curve_view
+
+    def moved_point(self, control_points: List[Tuple[float, float]]) -> Optional[int]:
+        """Index of the only point that differs from the current state.
+
+        Returns -1 when nothing changed and None when the change cannot be
+        applied as a single delta (point count changed, several points
+        moved, or a refresh is due).
+        """
+        current = self.control_points
+        if len(control_points) != len(current):
+            return None
+        moved = -1
+        for i, (point, old) in enumerate(zip(control_points, current)):
+            if point[0] != old[0] or point[1] != old[1]:
+                if moved >= 0:
+                    return None
+                moved = i
+        if moved >= 0 and self._deltas >= self.refresh_interval:
+            return None
+        return moved
+
+    def moved_in(self, store: ControlPointStore) -> Optional[int]:
+        """``moved_point`` for a store, answered from its version stamps."""
+        if store is not self._synced_store:
+            return None
+        moved = store.moved_since(self._synced_version)
+        if moved is not None and moved >= 0 and self._deltas >= self.refresh_interval:
+            return None
+        return moved
+
+    def reset(self, control_points: List[Tuple[float, float]]) -> np.ndarray:
+        """Evaluate the whole curve for new control points."""
+        points = np.asarray(control_points, dtype=float).reshape(-1, 2)
+        self.control_points = [(x, y) for x, y in points.tolist()]
+        self.basis = uniform_bernstein_basis(len(points), self.samples)
+        np.matmul(self.basis, points, out=self._curve)
+        self._deltas = 0
+        self._synced_store = None
+        return self.curve
+
+    def move_point(self, index: int, x: float, y: float) -> np.ndarray:
+        """Move one control point, updating the samples in O(samples)."""
+        old_x, old_y = self.control_points[index]
+        column = self.basis[:, index]
+        if x != old_x:
+            self.x += np.multiply(column, x - old_x, out=self._scratch)
+        if y != old_y:
+            self.y += np.multiply(column, y - old_y, out=self._scratch)
+        self.control_points[index] = (x, y)
+        self._deltas += 1
+        return self.curve
+
+    def update(self, control_points: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """Bring the curve to ``control_points`` by a delta or a full rebuild."""
+        if isinstance(control_points, np.ndarray):
+            control_points = control_points.reshape(-1, 2).tolist()
+        index = self.moved_point(control_points)
+        self._synced_store = None
+        if index is None:
+            return self.reset(control_points)
+        if index >= 0:
+            x, y = control_points[index]
+            self.move_point(index, float(x), float(y))
+        return self.curve
+
+    def sync(self, store: ControlPointStore) -> np.ndarray:
+        """Bring the curve to the points of ``store``."""
+        index = self.moved_in(store)
+        if index is None:
+            self.reset(store.points)
+        elif index >= 0:
+            x, y = store[index]
+            self.move_point(index, x, y)
+        self._synced_store = store
+        self._synced_version = store.version
+        return self.curve
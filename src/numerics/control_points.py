@@ -0,0 +1,218 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Smallest gap the editor keeps between control point x values, and
+# between the end points and the borders 0 and 1 of the normalized axis
+EPS = 1e-5
+
+
+def clamp_between(x: float, low: float, high: float, gap: float) -> float:
+    """Clamp ``x`` to [low + gap, high − gap], or to the midpoint of
+    (low, high) when they are less than 2 · gap apart, so it stays strictly
+    between them."""
+    if high - low < 2 * gap:
+        return 0.5 * (low + high)
+    return min(max(x, low + gap), high - gap)
+
+
+class ControlPointStore:
+    """Bézier control points kept in ascending x order in a float64 array.
+
+    The spectrum editor keeps control points strictly ordered by x so the
+    curve stays a function of wavelength, which makes the x column a sorted
+    index: hit testing and finding where a new point belongs are binary
+    searches (``np.searchsorted``) instead of scans over every point.
+    Rows live in a buffer that grows geometrically, so inserting or deleting
+    only shifts the rows after the edit in one contiguous copy.
+
+    The store is the model shared by the editor and the numerics. Edits
+    happen in place, ``points`` is a cached read-only view and
+    ``np.asarray(store)`` returns that view, so the store can be passed
+    straight to ``numerics.bezier`` and ``numerics.spectral`` without
+    copying. ``version`` increases on every edit and ``layout_version``
+    when points are added, removed or replaced, which lets caches tell a
+    single moved point (see ``moved_since``) from a new curve.
+    """
+
+    __slots__ = ("_data", "_size", "_view", "version", "layout_version", "_moved")
+
+    def __init__(self, points: Iterable[Tuple[float, float]] = ()) -> None:
+        points = np.asarray(
+            points if isinstance(points, np.ndarray) else list(points), dtype=float
+        ).reshape(-1, 2)
+        self._data = np.empty((max(2 * len(points), 16), 2), dtype=float)
+        self._size = 0
+        self.version = 0
+        self.layout_version = 0
+        self._moved: Optional[int] = None
+        self.set_points(points)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Tuple[float, float]:
+        if not -self._size <= index < self._size:
+            raise IndexError("Control point index out of range")
+        x, y = self._data[index % self._size].tolist()
+        return (x, y)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy or (dtype is not None and np.dtype(dtype) != self._data.dtype):
+            return np.array(self._view, dtype=dtype)
+        return self._view
+
+    @property
+    def points(self) -> np.ndarray:
+        """Read-only view of the points, shape (n, 2)."""
+        return self._view
+
+    @property
+    def x(self) -> np.ndarray:
+        """Read-only view of the sorted x coordinates."""
+        return self._view[:, 0]
+
+    def tolist(self) -> List[Tuple[float, float]]:
+        return [(x, y) for x, y in self._view.tolist()]
+
+    def copy(self) -> np.ndarray:
+        return self._view.copy()
+
+    def _resized(self, size: int) -> None:
+        self._size = size
+        self._view = self._data[:size]
+        self._view.setflags(write=False)
+        self._touch(None)
+        self.layout_version += 1
+
+    def _touch(self, moved: Optional[int]) -> None:
+        self.version += 1
+        self._moved = moved
+
+    def moved_since(self, version: int) -> Optional[int]:
+        """What changed since ``version`` of this store.
+
+        Returns -1 when nothing changed, the index of the point when a
+        single ``move`` happened, and None otherwise.
+        """
+        if version == self.version:
+            return -1
+        if version == self.version - 1 and self._moved is not None:
+            return self._moved
+        return None
+
+    def set_points(self, points: Iterable[Tuple[float, float]]) -> None:
+        """Replace all points; x must be strictly increasing."""
+        points = np.asarray(
+            points if isinstance(points, np.ndarray) else list(points), dtype=float
+        ).reshape(-1, 2)
+        if np.any(np.diff(points[:, 0]) <= 0):
+            raise ValueError("Control point x values must be strictly increasing")
+        self._replace(points)
+
+    def _replace(self, points: np.ndarray) -> None:
+        self._reserve(len(points))
+        self._data[: len(points)] = points
+        self._resized(len(points))
+
+    def assign(self, points: np.ndarray) -> None:
+        """Copy ``points`` in, recorded as a ``move`` when only one point
+        differs so incremental consumers can apply a delta.
+
+        Meant for mirroring another store, so the points are taken as they
+        are, without the ordering check of ``set_points``.
+        """
+        points = np.asarray(points, dtype=float)
+        if len(points) == self._size:
+            changed = np.flatnonzero((points != self._view).any(axis=1))
+            if len(changed) == 0:
+                return
+            if len(changed) == 1:
+                index = int(changed[0])
+                self.move(index, *points[index].tolist())
+                return
+        self._replace(points.reshape(-1, 2))
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._data):
+            data = np.empty((max(size, 2 * len(self._data)), 2), dtype=float)
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+
+    def insertion_index(self, x: float) -> int:
+        """Index keeping x order for a new inner point at ``x``.
+
+        The end points stay first and last, so the index is clamped to
+        [1, n − 1].
+        """
+        index = int(np.searchsorted(self.x, x, side="right"))
+        return min(max(index, 1), max(self._size - 1, 1))
+
+    def clamp_x(self, index: int, x: float, gap: float) -> float:
+        """``x`` limited so the point at ``index`` stays strictly between its
+        neighbours, ``gap`` away from them when there is room; the end
+        points are kept inside (0, 1)."""
+        xs = self._view[:, 0]
+        low = xs[index - 1] if index > 0 else 0.0
+        high = xs[index + 1] if index < self._size - 1 else 1.0
+        return clamp_between(x, float(low), float(high), gap)
+
+    def insert(self, index: int, x: float, y: float) -> None:
+        """Insert a point before ``index``; x must lie strictly between the
+        neighbours' x."""
+        if not 0 <= index <= self._size:
+            raise IndexError("Control point index out of range")
+        data = self._data
+        if (index > 0 and x <= data[index - 1, 0]) or (
+            index < self._size and x >= data[index, 0]
+        ):
+            raise ValueError("Control point x values must be strictly increasing")
+        self._reserve(self._size + 1)
+        data = self._data
+        data[index + 1 : self._size + 1] = data[index : self._size]
+        data[index] = (x, y)
+        self._resized(self._size + 1)
+
+    def delete(self, index: int) -> None:
+        if not 0 <= index < self._size:
+            raise IndexError("Control point index out of range")
+        data = self._data
+        data[index : self._size - 1] = data[index + 1 : self._size]
+        self._resized(self._size - 1)
+
+    def move(self, index: int, x: float, y: float) -> None:
+        """Set a point's coordinates in place; the caller keeps x ordered.
+
+        Moving a point onto its current position is not an edit and keeps
+        the version.
+        """
+        if not 0 <= index < self._size:
+            raise IndexError("Control point index out of range")
+        data = self._data
+        if data[index, 0] == x and data[index, 1] == y:
+            return
+        data[index, 0] = x
+        data[index, 1] = y
+        self._touch(index)
+
+    def hit_test(
+        self, x: float, y: float, radius_x: float, radius_y: float
+    ) -> Optional[int]:
+        """Index of the point within ``radius_x`` × ``radius_y`` of (x, y).
+
+        Candidates come from a binary search over the sorted x coordinates,
+        so only points in the x window are examined. When several points
+        match, the last inner point wins, then the last end point, so that
+        a point dragged onto an end point can still be picked up.
+        """
+        xs = self.x
+        first = int(np.searchsorted(xs, x - radius_x, side="left"))
+        last = int(np.searchsorted(xs, x + radius_x, side="right"))
+        if first >= last:
+            return None
+        near = np.abs(self._data[first:last, 1] - y) <= radius_y
+        candidates = np.flatnonzero(near) + first
+        if len(candidates) == 0:
+            return None
+        inner = candidates[(candidates > 0) & (candidates < self._size - 1)]
+        return int(inner[-1] if len(inner) else candidates[-1])
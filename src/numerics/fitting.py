@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import lsq_linear
+
+from .bezier import bernstein_basis
+from .spectral import SpectralIntegrator, get_integrator
+
+
+class BezierFitter:
+    """Least-squares Bézier fits of spectra sampled on a fixed grid.
+
+    The x control points are equally spaced over the measured wavelength
+    range, which makes x(t) linear in t: the curve is then a function of
+    wavelength by construction (the monotone-x constraint holds for any
+    fit) and each measured sample sits at a known t. What remains is linear
+    in the y control points, y(λ_k) = Σ B_i(t_k) · y_i, so the fit is one
+    multiplication by the pseudo-inverse of that Bernstein design matrix,
+    computed once per grid. Fitting a batch of spectra on the same grid is
+    a single matrix product.
+
+    Bernstein coefficients of a least-squares fit swing far outside the
+    data range as the degree grows (the control polygon of a 12-point fit
+    of a single Gaussian reaches ±40), so the system is augmented with a
+    penalty on the second differences of the y control points,
+    ``smoothing`` · M · ‖D y‖², which keeps the control polygon close to the
+    curve at a small cost in residual. The penalty is part of the
+    precomputed pseudo-inverse.
+
+    Parameters
+    ----------
+    wavelengths : np.ndarray
+        Increasing sample wavelengths (nm) of the measured spectra. Samples
+        outside the integrator's wavelength range are ignored.
+    n_points : int
+        Number of control points (curve degree + 1).
+    integrator : SpectralIntegrator
+        Defines the map between normalized curve coordinates and the
+        spectral domain, see ``scale_norm_to_spectral``.
+    pin_ends : bool
+        Keep the end points at y = 0 like the editor does; only the inner
+        points are fitted.
+    smoothing : float
+        Weight of the second-difference penalty relative to the mean
+        squared residual; 0 gives the plain least-squares fit.
+    """
+
+    def __init__(
+        self,
+        wavelengths: np.ndarray,
+        n_points: int,
+        integrator: SpectralIntegrator,
+        pin_ends: bool = True,
+        smoothing: float = 1e-3,
+    ) -> None:
+        wavelengths = np.asarray(wavelengths, dtype=float)
+        if np.any(np.diff(wavelengths) <= 0):
+            raise ValueError("Wavelengths must be strictly increasing")
+        if n_points < (3 if pin_ends else 2):
+            raise ValueError("Too few control points to fit")
+        if smoothing < 0:
+            raise ValueError("Smoothing must not be negative")
+        self.n_points = n_points
+        self.pin_ends = pin_ends
+        self.smoothing = smoothing
+        self.integrator = integrator
+
+        norm = (wavelengths - integrator.wl_min) / integrator.wl_span
+        self.mask = (norm >= 0.0) & (norm <= 1.0)
+        norm = norm[self.mask]
+        free = n_points - 2 if pin_ends else n_points
+        if len(norm) < max(free, 2):
+            raise ValueError(
+                f"Need at least {max(free, 2)} samples within the CMF range "
+                f"to fit {n_points} control points, got {len(norm)}"
+            )
+        self.x = np.linspace(norm[0], norm[-1], n_points)
+        self.x.setflags(write=False)
+        t = (norm - norm[0]) / (norm[-1] - norm[0])
+        self.design = bernstein_basis(n_points, t)
+        self.design.setflags(write=False)
+        self.free = slice(1, -1) if pin_ends else slice(None)
+        # Design rows followed by the penalty rows, whose targets are 0
+        penalty = np.diff(np.eye(n_points), 2, axis=0)[:, self.free]
+        self.system = np.vstack(
+            [self.design[:, self.free], np.sqrt(smoothing * len(t)) * penalty]
+        )
+        self.system.setflags(write=False)
+        # (free, M) map from normalized samples to the fitted y values
+        self.solver = np.ascontiguousarray(np.linalg.pinv(self.system)[:, : len(t)])
+        self.solver.setflags(write=False)
+
+    def fit(
+        self, values: np.ndarray, bounds: Optional[Tuple[float, float]] = None
+    ) -> np.ndarray:
+        """Control points of the least-squares fits.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Spectra of shape (M,) or (..., M) on the fitter's wavelengths.
+        bounds : Tuple[float, float], optional
+            Limits for the normalized y control points, e.g. (0, 1) for the
+            editor's coordinate system. Fits that leave them are solved again
+            as bounded least-squares problems, one spectrum at a time.
+
+        Returns
+        -------
+        np.ndarray
+            Normalized control points of shape (n, 2) or (..., n, 2).
+        """
+        values = np.asarray(values, dtype=float)[..., self.mask]
+        integrator = self.integrator
+        norm_values = (values - integrator.s_min) / integrator.s_span
+        control_points = np.zeros(values.shape[:-1] + (self.n_points, 2))
+        control_points[..., 0] = self.x
+        y = norm_values @ self.solver.T
+        if bounds is not None:
+            lower, upper = bounds
+            flat_y = y.reshape(-1, y.shape[-1])
+            flat_values = norm_values.reshape(-1, norm_values.shape[-1])
+            zeros = np.zeros(len(self.system) - flat_values.shape[-1])
+            outside = np.any((flat_y < lower) | (flat_y > upper), axis=-1)
+            for i in np.flatnonzero(outside).tolist():
+                target = np.concatenate([flat_values[i], zeros])
+                flat_y[i] = lsq_linear(self.system, target, bounds=bounds).x
+            y = flat_y.reshape(y.shape)
+        control_points[..., self.free, 1] = y
+        return control_points
+
+    def residuals(self, values: np.ndarray, control_points: np.ndarray) -> np.ndarray:
+        """Fitted minus measured values at the samples used, in spectral
+        units, shape (..., M')."""
+        values = np.asarray(values, dtype=float)[..., self.mask]
+        integrator = self.integrator
+        fitted = control_points[..., 1] @ self.design.T
+        return fitted * integrator.s_span + integrator.s_min - values
+
+
+_fitters: Dict[Tuple[bytes, int, bool, float], BezierFitter] = {}
+
+
+def get_bezier_fitter(
+    wavelengths: np.ndarray,
+    n_points: int,
+    integrator: SpectralIntegrator,
+    pin_ends: bool = True,
+    smoothing: float = 1e-3,
+) -> BezierFitter:
+    """Return a shared ``BezierFitter``, keyed on the grid, the CMF table
+    and the fit settings."""
+    digest = hashlib.blake2b(integrator.key, digest_size=16)
+    digest.update(np.ascontiguousarray(wavelengths, dtype=float).tobytes())
+    key = (digest.digest(), n_points, pin_ends, smoothing)
+    fitter = _fitters.get(key)
+    if fitter is None:
+        fitter = BezierFitter(wavelengths, n_points, integrator, pin_ends, smoothing)
+        _fitters[key] = fitter
+    return fitter
+
+
+def fit_bezier_to_spectrum(
+    sample_wavelengths: np.ndarray,
+    values: np.ndarray,
+    wavelengths: np.ndarray,
+    cmfs_values: np.ndarray,
+    n_points: int = 8,
+    pin_ends: bool = True,
+    smoothing: float = 1e-3,
+    bounds: Optional[Tuple[float, float]] = None,
+) -> np.ndarray:
+    """Fit Bézier control points to a measured SPD.
+
+    ``values`` may be one spectrum (M,) or a batch (..., M) sampled at
+    ``sample_wavelengths``; ``wavelengths`` and ``cmfs_values`` are the CMF
+    table defining the normalized curve coordinates. Returns control points
+    of shape (n_points, 2) or (..., n_points, 2) with equally spaced,
+    increasing x. See ``BezierFitter`` for ``smoothing`` and ``bounds``.
+    """
+    integrator = get_integrator(wavelengths, cmfs_values)
+    fitter = get_bezier_fitter(
+        sample_wavelengths, n_points, integrator, pin_ends, smoothing
+    )
+    return fitter.fit(values, bounds)
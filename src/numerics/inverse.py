@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import ConvexHull
+
+from .bezier import uniform_bernstein_basis
+from .control_points import EPS
+from .spectral import SpectralIntegrator, get_integrator
+
+# Iterations between convergence checks, after which solved rows leave the batch
+CHECK_INTERVAL = 25
+# Rows whose iterate moves less than this over a check interval are stuck on
+# an unreachable target
+STALL_STEP = 1e-9
+
+
+class InverseSolution(NamedTuple):
+    control_points: np.ndarray
+    XYZ: np.ndarray
+    converged: np.ndarray
+
+
+class BezierSpectrumSolver:
+    """Bézier spectra reproducing target XYZ or chromaticity values.
+
+    With the x control points fixed (equally spaced over the CMF range,
+    inset by the editor's ``EPS`` so solutions load into it unchanged) the
+    XYZ of ``calc_XYZ_from_bezier`` is linear in the y control points,
+    XYZ = J · y + c, where the (3, n) Jacobian J = s_span ·
+    ``sample_weights`` · Bernstein basis is exact and computed once. Among
+    the control polygons inside the editor's box (0 ≤ y ≤ 1, ends pinned at
+    0) that hit a target, the solver picks the smoothest one, minimizing
+    the squared second differences of y.
+
+    That is a convex quadratic program whose Hessian does not depend on
+    the target, solved by ADMM: the equality-constrained step is one
+    multiplication by a precomputed KKT inverse and the box constraint is a
+    clip, so a batch of targets iterates as (B, n) matrix products. Rows
+    leave the batch once within tolerance or once their iterate stops
+    moving, and a previous solution, e.g. of neighbouring targets, can be
+    passed as the starting point.
+
+    Non-negative y reach exactly the chromaticities inside the convex hull
+    of the Jacobian columns' chromaticities (at low enough luminance), so
+    targets outside it are rejected without iterating.
+
+    Parameters
+    ----------
+    integrator : SpectralIntegrator
+        CMF table and normalized coordinate map, see ``scale_norm_to_spectral``.
+    n_points : int
+        Number of control points; more points reach more saturated colours.
+    samples : int
+        Curve samples per spectrum, as in ``calc_XYZ_from_bezier``.
+    pin_ends : bool
+        Keep the end points at y = 0 like the editor does.
+    rho : float
+        ADMM penalty parameter.
+    """
+
+    def __init__(
+        self,
+        integrator: SpectralIntegrator,
+        n_points: int = 16,
+        samples: int = 100,
+        pin_ends: bool = True,
+        rho: float = 100.0,
+    ) -> None:
+        self.free = slice(1, -1) if pin_ends else slice(None)
+        free = len(range(n_points)[self.free])
+        if free < 3:
+            raise ValueError("Need at least three free control points")
+        self.integrator = integrator
+        self.n_points = n_points
+        self.samples = samples
+        self.pin_ends = pin_ends
+        self.rho = rho
+
+        self.x = np.linspace(EPS, 1.0 - EPS, n_points)
+        basis = uniform_bernstein_basis(n_points, samples)
+        curve_x = basis @ self.x * integrator.wl_span + integrator.wl_min
+        weights = integrator.sample_weights(curve_x)
+        # XYZ = jacobian @ y + offset for the y column of the control points
+        self.jacobian = integrator.s_span * weights @ basis
+        self.offset = integrator.s_min * weights.sum(axis=1)
+        # Y of the brightest curve in the box; the solver works in units of it
+        self.Y_max = float(self.jacobian[1, self.free].sum() + self.offset[1])
+
+        matrix = self.jacobian[:, self.free] / self.Y_max
+        penalty = np.diff(np.eye(n_points), 2, axis=0)[:, self.free]
+        kkt = np.zeros((free + 3, free + 3))
+        kkt[:free, :free] = penalty.T @ penalty + rho * np.eye(free)
+        kkt[:free, free:] = matrix.T
+        kkt[free:, :free] = matrix
+        inverse = np.linalg.inv(kkt)
+        # ADMM u-step: u = (z − w) @ step.T + target @ target_step.T
+        self.step = rho * inverse[:free, :free]
+        self.target_step = inverse[:free, free:]
+
+        columns = self.jacobian[:, self.free].T
+        totals = columns.sum(axis=1)
+        column_xy = columns[totals > 0, :2] / totals[totals > 0, None]
+        # Rows (nx, ny, offset) with nx·x + ny·y + offset <= 0 inside
+        self.reachable_hull = ConvexHull(column_xy).equations
+        for array in (
+            self.x,
+            self.jacobian,
+            self.offset,
+            self.step,
+            self.target_step,
+            self.reachable_hull,
+        ):
+            array.setflags(write=False)
+
+    def XYZ(self, control_points: np.ndarray) -> np.ndarray:
+        """XYZ of control points on the solver's x, (..., n, 2) -> (..., 3)."""
+        return np.asarray(control_points)[..., 1] @ self.jacobian.T + self.offset
+
+    def reachable_xy(self, xy: np.ndarray) -> np.ndarray:
+        """Whether (..., 2) chromaticities can be hit at some luminance."""
+        xy = np.asarray(xy, dtype=float)
+        inside = np.ones(xy.shape[:-1], dtype=bool)
+        for nx, ny, offset in self.reachable_hull.tolist():
+            inside &= xy[..., 0] * nx + xy[..., 1] * ny + offset <= 0
+        return inside
+
+    def solve_XYZ(
+        self,
+        XYZ: np.ndarray,
+        initial: Optional[np.ndarray] = None,
+        tolerance: float = 1e-4,
+        max_iterations: int = 2000,
+    ) -> InverseSolution:
+        """Solve for (..., 3) target XYZ values.
+
+        A target counts as reached when every component is within
+        ``tolerance`` · max(|XYZ|) of it. Targets out of reach return
+        ``converged`` False, as all-zero curves when their chromaticity is
+        outside ``reachable_xy`` and as the last iterate when they are too
+        bright. XYZ = 0 is solved by the all-zero curve. Only the y values
+        of the (..., n, 2) ``initial`` control points are used.
+        """
+        XYZ = np.asarray(XYZ, dtype=float)
+        targets = XYZ.reshape(-1, 3)
+        bounds = tolerance * np.abs(targets).max(axis=1)
+        totals = targets.sum(axis=1, keepdims=True)
+        black = ~targets.any(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            reachable = self.reachable_xy(targets[:, :2] / totals) & ~black
+        rows = np.flatnonzero(reachable)
+
+        def reached(y: np.ndarray, subset: np.ndarray) -> np.ndarray:
+            error = np.abs(self._free_XYZ(y) - targets[rows[subset]]).max(axis=1)
+            return error <= bounds[rows[subset]]
+
+        y = self._initial_y(initial, len(targets))
+        y[~reachable] = 0.0
+        converged = black.copy()
+        y[rows], converged[rows] = self._solve(
+            targets[rows], reached, y[rows], max_iterations
+        )
+        return self._solution(y, converged, XYZ.shape[:-1])
+
+    def solve_xy(
+        self,
+        xy: np.ndarray,
+        luminance: Optional[float] = None,
+        initial: Optional[np.ndarray] = None,
+        tolerance: float = 1e-4,
+        max_iterations: int = 2000,
+        dimming_steps: int = 3,
+    ) -> InverseSolution:
+        """Solve for (..., 2) target chromaticities.
+
+        Spectra are solved at Y = ``luminance`` (default 0.1 · ``Y_max``).
+        Targets out of reach are retried at half the luminance, up to
+        ``dimming_steps`` times, since dimmer spectra can be narrower. A
+        target counts as reached when x and y are within ``tolerance``;
+        targets outside ``reachable_xy`` are returned as all-zero curves.
+        At zero luminance every target is solved by the all-zero curve.
+        """
+        xy = np.asarray(xy, dtype=float)
+        flat_xy = xy.reshape(-1, 2)
+        if luminance is None:
+            luminance = 0.1 * self.Y_max
+        if luminance < 0:
+            raise ValueError("Luminance must not be negative")
+        if luminance == 0:
+            y = np.zeros((len(flat_xy), self.step.shape[0]))
+            return self._solution(y, np.ones(len(flat_xy), dtype=bool), xy.shape[:-1])
+        Y = np.full(len(flat_xy), float(luminance))
+
+        def reached(y: np.ndarray, rows: np.ndarray) -> np.ndarray:
+            XYZ = self._free_XYZ(y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                error = np.abs(
+                    XYZ[:, :2] / XYZ.sum(axis=1, keepdims=True) - flat_xy[rows]
+                )
+            return error.max(axis=1) <= tolerance
+
+        reachable = self.reachable_xy(flat_xy)
+        y = self._initial_y(initial, len(flat_xy))
+        y[~reachable] = 0.0
+        converged = np.zeros(len(flat_xy), dtype=bool)
+        rows = np.flatnonzero(reachable)
+        for _ in range(dimming_steps + 1):
+            x, y_target = flat_xy[rows].T
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.where(y_target > 0, Y[rows] / y_target, 0.0)
+            targets = np.column_stack([x * scale, Y[rows], (1 - x - y_target) * scale])
+            y[rows], converged[rows] = self._solve(
+                targets,
+                lambda y_rows, subset, rows=rows: reached(y_rows, rows[subset]),
+                y[rows],
+                max_iterations,
+            )
+            rows = rows[~converged[rows]]
+            if len(rows) == 0:
+                break
+            Y[rows] *= 0.5
+        return self._solution(y, converged, xy.shape[:-1])
+
+    def _free_XYZ(self, y: np.ndarray) -> np.ndarray:
+        return y @ self.jacobian[:, self.free].T + self.offset
+
+    def _initial_y(self, initial: Optional[np.ndarray], count: int) -> np.ndarray:
+        free = self.step.shape[0]
+        if initial is None:
+            return np.zeros((count, free))
+        initial = np.asarray(initial, dtype=float).reshape(count, self.n_points, 2)
+        return np.clip(initial[:, self.free, 1], 0.0, 1.0)
+
+    def _solve(
+        self,
+        targets: np.ndarray,
+        reached: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        y: np.ndarray,
+        max_iterations: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """ADMM iterations for (B, 3) targets from the free y values ``y``.
+
+        ``reached(y, rows)`` tells which of ``rows`` are solved by ``y``.
+        Returns the free y values and whether each row was solved.
+        """
+        target_terms = ((targets - self.offset) / self.Y_max) @ self.target_step.T
+        z = y.copy()
+        w = np.zeros_like(z)
+        converged = np.zeros(len(targets), dtype=bool)
+        active = np.arange(len(targets))
+        # Warm starts that already hit their target need no iterations
+        done = reached(z, active)
+        converged[done] = True
+        active = active[~done]
+        iterations = 0
+        while len(active) and iterations < max_iterations:
+            z_start = z[active]
+            z_active, w_active = z_start, w[active]
+            target_active = target_terms[active]
+            for _ in range(CHECK_INTERVAL):
+                u = (z_active - w_active) @ self.step.T
+                u += target_active
+                z_active = np.clip(u + w_active, 0.0, 1.0)
+                w_active += u
+                w_active -= z_active
+            iterations += CHECK_INTERVAL
+            z[active] = z_active
+            w[active] = w_active
+            done = reached(z_active, active)
+            converged[active[done]] = True
+            stalled = np.abs(z_active - z_start).max(axis=1) < STALL_STEP
+            active = active[~(done | stalled)]
+        return z, converged
+
+    def _solution(
+        self, y: np.ndarray, converged: np.ndarray, shape: Tuple[int, ...]
+    ) -> InverseSolution:
+        control_points = np.zeros((len(y), self.n_points, 2))
+        control_points[..., 0] = self.x
+        control_points[:, self.free, 1] = y
+        control_points = control_points.reshape(shape + (self.n_points, 2))
+        return InverseSolution(
+            control_points, self.XYZ(control_points), converged.reshape(shape)
+        )
+
+
+_solvers: Dict[Tuple[bytes, int, int, bool], BezierSpectrumSolver] = {}
+
+
+def get_spectrum_solver(
+    integrator: SpectralIntegrator,
+    n_points: int = 16,
+    samples: int = 100,
+    pin_ends: bool = True,
+) -> BezierSpectrumSolver:
+    """Return a shared ``BezierSpectrumSolver`` for the CMF table and
+    curve settings."""
+    key = (integrator.key, n_points, samples, pin_ends)
+    solver = _solvers.get(key)
+    if solver is None:
+        solver = BezierSpectrumSolver(integrator, n_points, samples, pin_ends)
+        _solvers[key] = solver
+    return solver
+
+
+def solve_bezier_for_XYZ(
+    XYZ: np.ndarray,
+    wavelengths: np.ndarray,
+    cmfs_values: np.ndarray,
+    n_points: int = 16,
+    initial: Optional[np.ndarray] = None,
+    tolerance: float = 1e-4,
+) -> InverseSolution:
+    """Control points whose ``calc_XYZ_from_bezier`` matches (..., 3) XYZ.
+
+    See ``BezierSpectrumSolver.solve_XYZ``.
+    """
+    integrator = get_integrator(wavelengths, cmfs_values)
+    solver = get_spectrum_solver(integrator, n_points)
+    return solver.solve_XYZ(XYZ, initial, tolerance)
+
+
+def solve_bezier_for_xy(
+    xy: np.ndarray,
+    wavelengths: np.ndarray,
+    cmfs_values: np.ndarray,
+    n_points: int = 16,
+    luminance: Optional[float] = None,
+    initial: Optional[np.ndarray] = None,
+    tolerance: float = 1e-4,
+) -> InverseSolution:
+    """Control points whose chromaticity matches (..., 2) ``xy``.
+
+    See ``BezierSpectrumSolver.solve_xy``.
+    """
+    integrator = get_integrator(wavelengths, cmfs_values)
+    solver = get_spectrum_solver(integrator, n_points)
+    return solver.solve_xy(xy, luminance, initial, tolerance)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .spectral import SpectralIntegrator
+
+# A shard is either a stacked array or a list of per-record arrays whose
+# control point counts may differ
+Shard = Union[np.ndarray, Sequence[np.ndarray]]
+
+
+class ShardTiming(NamedTuple):
+    index: int
+    start: int
+    stop: int
+    seconds: float
+    worker_pid: int
+
+
+def calc_shard_XYZ(
+    integrator: SpectralIntegrator,
+    shard: Shard,
+    kind: str = "bezier",
+    samples: int = 100,
+    spectra_wavelengths: Optional[np.ndarray] = None,
+    tolerance: Optional[float] = None,
+) -> np.ndarray:
+    """XYZ of one shard of Bézier curves or sampled spectra, shape (B, 3).
+
+    ``kind`` is ``"bezier"`` for control point sets or ``"spectra"`` for
+    spectra sampled on ``spectra_wavelengths`` (default: the CMF grid).
+    Bézier curves use ``samples`` uniform samples, or the slower adaptive
+    sampling within the absolute XYZ ``tolerance`` when it is given.
+    """
+    if kind == "spectra":
+        spectra = np.asarray(shard, dtype=float)
+        if spectra_wavelengths is None:
+            spectra_wavelengths = integrator.wavelengths
+        if spectra.ndim != 2 or spectra.shape[1] != len(spectra_wavelengths):
+            raise ValueError(
+                f"Spectra must have {len(spectra_wavelengths)} samples per record"
+            )
+        return spectra @ integrator.kernel_for(spectra_wavelengths).T
+    if kind != "bezier":
+        raise ValueError(f"Unknown shard kind: {kind}")
+
+    def calc_stacked(stacked: np.ndarray) -> np.ndarray:
+        if tolerance is None:
+            return integrator.XYZ_from_bezier_batch(stacked, samples)
+        return integrator.XYZ_from_bezier_adaptive(stacked, tolerance)[0]
+
+    if isinstance(shard, np.ndarray):
+        return calc_stacked(shard)
+    # Curves with different control point counts are batched separately
+    XYZ = np.empty((len(shard), 3), dtype=float)
+    counts = np.array([len(cps) for cps in shard])
+    for n in np.unique(counts):
+        idx = np.flatnonzero(counts == n)
+        stacked = np.stack([shard[i] for i in idx])
+        XYZ[idx] = calc_stacked(stacked)
+    return XYZ
+
+
+# Per-process state of pool workers, set up by _init_worker
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_integrator: Optional[SpectralIntegrator] = None
+
+
+def _init_worker(memory_name: str, rows: int) -> None:
+    global _worker_memory, _worker_integrator
+    # Workers share the parent's resource tracker, which unlinks the block
+    # only if the parent dies without calling close()
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    table = np.ndarray((rows, 4), dtype=float, buffer=_worker_memory.buf)
+    table.flags.writeable = False
+    _worker_integrator = SpectralIntegrator(table[:, 0], table[:, 1:])
+
+
+def _run_shard(
+    shard: Shard,
+    kind: str,
+    samples: int,
+    spectra_wavelengths: Optional[np.ndarray],
+    tolerance: Optional[float],
+) -> Tuple[np.ndarray, float, int]:
+    start = time.perf_counter()
+    XYZ = calc_shard_XYZ(
+        _worker_integrator, shard, kind, samples, spectra_wavelengths, tolerance
+    )
+    return XYZ, time.perf_counter() - start, os.getpid()
+
+
+class ParallelBatchExecutor:
+    """Computes XYZ of large batches on a pool of worker processes.
+
+    The CMF table is copied once into a shared memory block that every
+    worker maps read-only, so it is never pickled per task. Batches are
+    split into shards of ``shard_size`` records whose results are gathered
+    back in input order; ``shard_timings`` holds the timing of every shard
+    of the last batch.
+    """
+
+    def __init__(
+        self,
+        wavelengths: np.ndarray,
+        cmfs_values: np.ndarray,
+        workers: Optional[int] = None,
+        shard_size: int = 10000,
+    ) -> None:
+        if shard_size < 1:
+            raise ValueError("Shard size must be at least 1")
+        table = np.column_stack([wavelengths, cmfs_values]).astype(float)
+        self._memory = shared_memory.SharedMemory(create=True, size=table.nbytes)
+        np.ndarray(table.shape, dtype=float, buffer=self._memory.buf)[:] = table
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.shard_timings: List[ShardTiming] = []
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._memory.name, table.shape[0]),
+        )
+
+    def __enter__(self) -> ParallelBatchExecutor:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._memory.close()
+        self._memory.unlink()
+
+    def submit(
+        self,
+        shard: Shard,
+        kind: str = "bezier",
+        samples: int = 100,
+        spectra_wavelengths: Optional[np.ndarray] = None,
+        tolerance: Optional[float] = None,
+    ) -> Future:
+        """Schedule one shard; the future yields (XYZ, seconds, worker_pid)."""
+        return self._pool.submit(
+            _run_shard, shard, kind, samples, spectra_wavelengths, tolerance
+        )
+
+    def XYZ_from_bezier(
+        self,
+        control_points: np.ndarray,
+        samples: int = 100,
+        tolerance: Optional[float] = None,
+    ) -> np.ndarray:
+        """XYZ of stacked control point sets, shape (B, n, 2) -> (B, 3)."""
+        control_points = np.asarray(control_points, dtype=float)
+        if control_points.ndim != 3 or control_points.shape[-1] != 2:
+            raise ValueError("Control points must have shape (B, n, 2)")
+        return self._map(control_points, "bezier", samples, None, tolerance)
+
+    def XYZ_from_spectra(
+        self, spectra: np.ndarray, spectra_wavelengths: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """XYZ of stacked sampled spectra, shape (B, M) -> (B, 3)."""
+        spectra = np.asarray(spectra, dtype=float)
+        if spectra.ndim != 2:
+            raise ValueError("Spectra must have shape (B, M)")
+        return self._map(spectra, "spectra", 100, spectra_wavelengths)
+
+    def _map(
+        self,
+        data: np.ndarray,
+        kind: str,
+        samples: int,
+        spectra_wavelengths: Optional[np.ndarray],
+        tolerance: Optional[float] = None,
+    ) -> np.ndarray:
+        bounds = [
+            (start, min(start + self.shard_size, len(data)))
+            for start in range(0, len(data), self.shard_size)
+        ]
+        futures = [
+            self.submit(data[start:stop], kind, samples, spectra_wavelengths, tolerance)
+            for start, stop in bounds
+        ]
+        XYZ = np.empty((len(data), 3), dtype=float)
+        self.shard_timings = []
+        for index, ((start, stop), future) in enumerate(zip(bounds, futures)):
+            shard_XYZ, seconds, pid = future.result()
+            XYZ[start:stop] = shard_XYZ
+            self.shard_timings.append(ShardTiming(index, start, stop, seconds, pid))
+        return XYZ
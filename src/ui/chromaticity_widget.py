@@ -2,12 +2,41 @@ from __future__ import annotations
 
 from typing import List, Optional, Tuple
 
-from PySide6.QtCore import Signal
-from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QPixmap, Qt
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Signal
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QPainter,
+    QPen,
+    QPixmap,
+    QPolygonF,
+    QRegion,
+    Qt,
+)
 from PySide6.QtWidgets import QWidget
 
+from color.gamut import D65_WHITE, Gamut, get_gamut
+from color.locus import LOCUS_MAX_WAVELENGTH, SpectralLocus, get_spectral_locus
 from color.space import XYZ_to_sRGB, xyY_to_XYZ
-from utils import get_path_from_resources, load_color_matching_funcs
+from instrumentation import profiler
+from utils import DEFAULT_OBSERVER
+
+from .diagram_tiles import DiagramTileCache
+
+# Zoom factor per mouse wheel step and the allowed zoom range
+ZOOM_STEP = 1.25
+MIN_ZOOM = 0.5
+MAX_ZOOM = 200.0
+# Grid lines are refined while they stay at least this far apart (px)
+MIN_GRID_SPACING_PX = 40
+WAVELENGTH_LABELS = (460, 480, 500, 520, 540, 560, 580, 600, 620)
+WHITE_POINT = np.array(D65_WHITE)
+GAMUT_COLORS = {
+    "sRGB": (0, 0, 0),
+    "Display P3": (30, 30, 160),
+    "Rec.2020": (110, 110, 110),
+}
 
 
 class ChromaticityDiagramWidget(QWidget):
@@ -15,64 +44,322 @@ class ChromaticityDiagramWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        diagram_image_original = QPixmap(get_path_from_resources("cie_xyz.png"))
-        # Coordinates of the pixel that is the origin of the coordinate system
-        # in the original image
-        coord_origin_x_original = 145
-        coord_origin_y_original = 1153
-        # Number of pixels corresponding to the length of the [0.0, 1.0] range
-        # in the coordinate system of the original image
-        coord_scale_original = 1220
-        # Fixed, fitted image height, width and a Y offset so the image fits
-        # nicely into the widget
-        fitted_width = 450
-        fitted_height = 440
-        self.fitted_offset_y = 30
-
-        self.diagram_image = diagram_image_original.scaled(
-            fitted_width, fitted_height, Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
-        scale_factor = self.diagram_image.width() / diagram_image_original.width()
-        self.coord_origin_x: int = int(coord_origin_x_original * scale_factor)
-        self.coord_origin_y: int = int(coord_origin_y_original * scale_factor)
-        self.coord_scale: float = coord_scale_original * scale_factor
+        # Margins (px) around the plot area: left, top, right, bottom; the
+        # top one leaves room for the color label row
+        self.margins: Tuple[int, int, int, int] = (45, 30, 15, 40)
+        # Chromaticity extent fitted into the plot area at zoom 1
+        self.x_extent: Tuple[float, float] = (0.0, 0.8)
+        self.y_extent: Tuple[float, float] = (0.0, 0.9)
+        self.zoom: float = 1.0
+        # Offset (px) of the diagram from its fitted position
+        self.pan: QPointF = QPointF(0.0, 0.0)
+        self._pan_anchor: Optional[Tuple[QPointF, QPointF]] = None
+        # Widget position of xy = (0, 0) and pixels per unit of chromaticity,
+        # derived from the size, zoom and pan by update_view_transform
+        self.coord_origin_x: float = 0.0
+        self.coord_origin_y: float = 0.0
+        self.coord_scale: float = 1.0
+        self.tiles = DiagramTileCache()
 
         self.chromaticity_point_XYZ: List[float] = [0.0, 0.0, 0.0]
 
         self.show_gamut: bool = True
+        # Gamuts overlaid while show_gamut is on
+        self.gamuts: List[str] = ["sRGB"]
         self.show_spectral_locus: bool = True
+        # Static layers (diagram, axes, spectral locus, gamut) composited
+        # once; rebuilt only after a resize, zoom, pan or an overlay toggle.
+        # While panning it is blitted shifted by the pan since it was drawn
+        # and rebuilt once the drag ends
+        self.background: Optional[QPixmap] = None
+        self._background_pan: QPointF = QPointF(0.0, 0.0)
 
-        self.locus_points: List[Tuple[float, float, QColor]] = (
-            self.calc_spectral_locus_points()
-        )
+        self.observer: str = DEFAULT_OBSERVER
+        # Wavelength range (nm) and resolution of the drawn spectral locus;
+        # None keeps the range or samples of the CMF table
+        self.locus_min_wavelength: Optional[float] = None
+        self.locus_max_wavelength: Optional[float] = LOCUS_MAX_WAVELENGTH
+        self.locus_step: Optional[float] = None
+        self.spectral_locus: SpectralLocus = self.calc_spectral_locus()
 
     def set_XYZ(self, XYZ: List[float]) -> None:
-        self.chromaticity_point_XYZ = XYZ
-        rgb = self.calc_current_RGB_val()
-        if rgb is not None:
-            self.colorChanged.emit(self.calc_current_RGB_val())
-        self.update()
+        with profiler.timer("chromaticity.set_XYZ"):
+            self.chromaticity_point_XYZ = XYZ
+            rgb = self.calc_current_RGB_val()
+            if rgb is not None:
+                self.colorChanged.emit(rgb)
+            self.update()
 
     def paintEvent(self, event) -> None:
         painter = QPainter(self)
+        try:
+            with profiler.timer("chromaticity.paint"):
+                painter.setRenderHint(QPainter.Antialiasing)
+                if self.background is None:
+                    self.draw_background()
+                plot = self.plot_rect()
+                shift = self.pan - self._background_pan
+                if shift.isNull():
+                    painter.drawPixmap(0, 0, self.background)
+                else:
+                    # Axes stay put; only the plot area follows the drag
+                    painter.setClipRegion(
+                        QRegion(self.rect()) - QRegion(plot.toAlignedRect())
+                    )
+                    painter.drawPixmap(0, 0, self.background)
+                    painter.setClipRect(plot)
+                    painter.drawPixmap(shift, self.background)
+                painter.setClipRect(plot)
+                self.setup_coord_system_origin(painter)
+                self.draw_chromaticity_point(painter)
+        finally:
+            painter.end()
+
+    def draw_background(self) -> None:
+        self.update_view_transform()
+        pixel_ratio = self.devicePixelRatioF()
+        background = QPixmap(self.size() * pixel_ratio)
+        background.setDevicePixelRatio(pixel_ratio)
+        background.fill(Qt.transparent)
+        plot = self.plot_rect()
+        painter = QPainter(background)
         try:
             painter.setRenderHint(QPainter.Antialiasing)
-            painter.drawPixmap(0, self.fitted_offset_y, self.diagram_image)
+            painter.save()
+            painter.setClipRect(plot)
+            self.draw_grid(painter, plot)
+            self.tiles.draw(
+                painter,
+                QPointF(self.coord_origin_x, self.coord_origin_y),
+                self.coord_scale,
+                pixel_ratio,
+                self.width(),
+                self.height(),
+            )
             self.setup_coord_system_origin(painter)
+            self.draw_locus_outline(painter)
             if self.show_spectral_locus:
                 self.draw_spectral_locus(painter)
             if self.show_gamut:
-                self.draw_sRGB_gamut(painter)
-            self.draw_chromaticity_point(painter)
+                self.draw_gamuts(painter)
+            painter.restore()
+            self.draw_axes(painter, plot)
         finally:
             painter.end()
+        self.background = background
+        self._background_pan = QPointF(self.pan)
 
-    def setup_coord_system_origin(self, painter: QPainter) -> None:
-        painter.translate(
-            self.coord_origin_x, self.coord_origin_y + self.fitted_offset_y
+    def invalidate_background(self) -> None:
+        self.background = None
+        self.update()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.background = None
+
+    def plot_rect(self) -> QRectF:
+        left, top, right, bottom = self.margins
+        return QRectF(
+            left,
+            top,
+            max(self.width() - left - right, 1),
+            max(self.height() - top - bottom, 1),
+        )
+
+    def fitted_origin(self, zoom: float) -> QPointF:
+        """Position of xy = (0, 0) for ``zoom`` without any pan."""
+        plot = self.plot_rect()
+        (x_min, x_max), (y_min, y_max) = self.x_extent, self.y_extent
+        scale = zoom * min(
+            plot.width() / (x_max - x_min), plot.height() / (y_max - y_min)
+        )
+        return QPointF(plot.left() - x_min * scale, plot.bottom() + y_min * scale)
+
+    def update_view_transform(self) -> None:
+        plot = self.plot_rect()
+        (x_min, x_max), (y_min, y_max) = self.x_extent, self.y_extent
+        fitted_scale = min(
+            plot.width() / (x_max - x_min), plot.height() / (y_max - y_min)
         )
+        self.coord_scale = fitted_scale * self.zoom
+        origin = self.fitted_origin(self.zoom) + self.pan
+        self.coord_origin_x = origin.x()
+        self.coord_origin_y = origin.y()
+
+    def widget_to_xy(self, position: QPointF) -> Tuple[float, float]:
+        x = (position.x() - self.coord_origin_x) / self.coord_scale
+        y = (self.coord_origin_y - position.y()) / self.coord_scale
+        return (x, y)
+
+    def zoom_at(self, position: QPointF, factor: float) -> None:
+        """Zoom by ``factor`` keeping the chromaticity under ``position``."""
+        self.update_view_transform()
+        zoom = min(max(self.zoom * factor, MIN_ZOOM), MAX_ZOOM)
+        origin = QPointF(self.coord_origin_x, self.coord_origin_y)
+        new_origin = position - (position - origin) * (zoom / self.zoom)
+        self.pan = new_origin - self.fitted_origin(zoom)
+        self.zoom = zoom
+        self.invalidate_background()
+
+    def reset_view(self) -> None:
+        self.zoom = 1.0
+        self.pan = QPointF(0.0, 0.0)
+        self.invalidate_background()
+
+    def wheelEvent(self, event) -> None:
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom_at(event.position(), ZOOM_STEP**steps)
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton:
+            self._pan_anchor = (event.position(), QPointF(self.pan))
+
+    def mouseMoveEvent(self, event) -> None:
+        if self._pan_anchor is None:
+            return
+        start, pan = self._pan_anchor
+        self.pan = pan + (event.position() - start)
+        self.update_view_transform()
+        self.update()
+
+    def mouseReleaseEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton and self._pan_anchor is not None:
+            self._pan_anchor = None
+            if self.pan != self._background_pan:
+                self.invalidate_background()
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        if event.button() == Qt.LeftButton:
+            self.reset_view()
+
+    def setup_coord_system_origin(self, painter: QPainter) -> None:
+        painter.translate(self.coord_origin_x, self.coord_origin_y)
         painter.scale(1, -1)
 
+    def grid_step(self) -> float:
+        """Finest of 0.1, 0.05, 0.02, 0.01, ... keeping grid lines apart."""
+        step = 0.1
+        for exponent in range(2, 6):
+            for mantissa in (5, 2, 1):
+                candidate = mantissa * 10.0**-exponent
+                if candidate * self.coord_scale < MIN_GRID_SPACING_PX:
+                    return step
+                step = candidate
+        return step
+
+    def grid_values(self, plot: QRectF) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Visible x and y grid values and the decimals to label them with."""
+        step = self.grid_step()
+        x_min, y_max = self.widget_to_xy(plot.topLeft())
+        x_max, y_min = self.widget_to_xy(plot.bottomRight())
+        xs = np.arange(np.ceil(x_min / step), np.floor(x_max / step) + 1) * step
+        ys = np.arange(np.ceil(y_min / step), np.floor(y_max / step) + 1) * step
+        decimals = max(1, int(np.ceil(-np.log10(step) - 1e-9)))
+        return xs, ys, decimals
+
+    def draw_grid(self, painter: QPainter, plot: QRectF) -> None:
+        xs, ys, _ = self.grid_values(plot)
+        painter.save()
+        painter.setPen(QPen(QColor(215, 215, 215), 1))
+        for x in xs.tolist():
+            px = self.coord_origin_x + x * self.coord_scale
+            painter.drawLine(QPointF(px, plot.top()), QPointF(px, plot.bottom()))
+        for y in ys.tolist():
+            py = self.coord_origin_y - y * self.coord_scale
+            painter.drawLine(QPointF(plot.left(), py), QPointF(plot.right(), py))
+        painter.restore()
+
+    def draw_axes(self, painter: QPainter, plot: QRectF) -> None:
+        xs, ys, decimals = self.grid_values(plot)
+        tick_len = 5
+        painter.save()
+        painter.setPen(QPen(QColor(0, 0, 0), 1))
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        painter.drawLine(plot.bottomLeft(), plot.topLeft())
+        font = painter.font()
+        font.setPointSize(8)
+        painter.setFont(font)
+        metrics = painter.fontMetrics()
+        for x in xs.tolist():
+            px = self.coord_origin_x + x * self.coord_scale
+            painter.drawLine(
+                QPointF(px, plot.bottom()), QPointF(px, plot.bottom() + tick_len)
+            )
+            text = f"{x:.{decimals}f}"
+            painter.drawText(
+                QPointF(
+                    px - metrics.horizontalAdvance(text) / 2,
+                    plot.bottom() + tick_len + metrics.ascent() + 1,
+                ),
+                text,
+            )
+        for y in ys.tolist():
+            py = self.coord_origin_y - y * self.coord_scale
+            painter.drawLine(
+                QPointF(plot.left() - tick_len, py), QPointF(plot.left(), py)
+            )
+            text = f"{y:.{decimals}f}"
+            painter.drawText(
+                QPointF(
+                    plot.left() - tick_len - 3 - metrics.horizontalAdvance(text),
+                    py + metrics.ascent() / 2 - 1,
+                ),
+                text,
+            )
+
+        # Axis titles
+        font.setItalic(True)
+        font.setPointSize(10)
+        painter.setFont(font)
+        painter.drawText(QPointF(plot.center().x(), plot.bottom() + tick_len + 30), "x")
+        painter.drawText(QPointF(plot.left() - 40, plot.center().y()), "y")
+        painter.restore()
+
+    def draw_locus_outline(self, painter: QPainter) -> None:
+        """Outline of the spectral locus, closed by the purple line, with
+        wavelength labels pointing away from the white point"""
+        locus = get_spectral_locus(self.observer, max_wavelength=LOCUS_MAX_WAVELENGTH)
+        points = locus.xy * self.coord_scale
+        painter.save()
+        painter.setPen(QPen(QColor(0, 0, 0), 1.5))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolygon(QPolygonF([QPointF(x, y) for x, y in points.tolist()]))
+
+        labels = np.array(WAVELENGTH_LABELS, dtype=float)
+        inside = (labels >= locus.wavelengths[0]) & (labels <= locus.wavelengths[-1])
+        labels = labels[inside]
+        xy = np.column_stack(
+            [np.interp(labels, locus.wavelengths, locus.xy[:, i]) for i in range(2)]
+        )
+        normals = xy - WHITE_POINT
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        font = painter.font()
+        font.setPointSize(9)
+        painter.setFont(font)
+        metrics = painter.fontMetrics()
+        for wavelength, (x, y), (nx, ny) in zip(
+            labels.tolist(), (xy * self.coord_scale).tolist(), normals.tolist()
+        ):
+            painter.setPen(QPen(QColor(0, 0, 0), 1))
+            painter.drawLine(QPointF(x, y), QPointF(x + 6 * nx, y + 6 * ny))
+            text = f"{wavelength:.0f}"
+            # Text is drawn in the unflipped system around the label anchor
+            anchor_x = x + 18 * nx
+            anchor_y = -(y + 18 * ny)
+            painter.save()
+            painter.scale(1, -1)
+            painter.setPen(QPen(QColor(20, 20, 200)))
+            painter.drawText(
+                QPointF(
+                    anchor_x - metrics.horizontalAdvance(text) / 2,
+                    anchor_y + metrics.ascent() / 2 - 1,
+                ),
+                text,
+            )
+            painter.restore()
+        painter.restore()
+
     def calc_chromaticity_point_xyz_values(
         self,
     ) -> Optional[Tuple[float, float, float]]:
@@ -123,62 +410,79 @@ class ChromaticityDiagramWidget(QWidget):
         painter.restore()
 
     def draw_spectral_locus(self, painter: QPainter) -> None:
-        for point in self.locus_points:
-            x = point[0]
-            y = point[1]
-            color = point[2]
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(color))
-            self.draw_circle(painter, x, y, 2)
+        """Draw locus points as round pen dots, one point array per color."""
+        points = self.spectral_locus.xy * self.coord_scale
+        colors, color_idx = np.unique(
+            self.spectral_locus.rgb, axis=0, return_inverse=True
+        )
+        color_idx = color_idx.ravel()
+        painter.save()
+        for i, (r, g, b) in enumerate(colors.tolist()):
+            pen = QPen(QColor(r, g, b), 5)
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawPoints(
+                QPolygonF([QPointF(x, y) for x, y in points[color_idx == i].tolist()])
+            )
+        painter.restore()
 
-    def calc_spectral_locus_points(self) -> List[Tuple[float, float, QColor]]:
+    def calc_spectral_locus(self) -> SpectralLocus:
         """Compute spectral locus points colored by sRGB.
 
-        Converts CMFs to chromaticity (x,y), trims wavelengths to match the
-        background image extent, and maps each (x,y) to an sRGB color via
-        XYZ to sRGB conversion for display.
+        Converts CMFs of the selected observer to chromaticity (x,y) over the
+        configured wavelength range and maps each (x,y) to an sRGB color.
+        Results are cached per observer and range.
         """
-        wavelenghts, cmfs_values = load_color_matching_funcs()
-        locus_points = []
-
-        # Trim the range to match the image
-        mask = wavelenghts <= 680
-        cmfs_values = cmfs_values[mask]
-
-        for cmf_x_val, cmf_y_val, cmf_z_val in cmfs_values:
-            XYZ_sum = cmf_x_val + cmf_y_val + cmf_z_val
-            if XYZ_sum == 0:
-                continue
-            x = cmf_x_val / XYZ_sum
-            y = cmf_y_val / XYZ_sum
-            X, Y, Z = xyY_to_XYZ(x, y, 1.0)
-            r, g, b = XYZ_to_sRGB(X, Y, Z)
-            locus_points.append((x, y, QColor(r, g, b)))
+        return get_spectral_locus(
+            self.observer,
+            self.locus_min_wavelength,
+            self.locus_max_wavelength,
+            self.locus_step,
+        )
 
-        return locus_points
+    def set_spectral_locus_range(
+        self,
+        min_wavelength: Optional[float] = None,
+        max_wavelength: Optional[float] = None,
+        step: Optional[float] = None,
+    ) -> None:
+        self.locus_min_wavelength = min_wavelength
+        self.locus_max_wavelength = max_wavelength
+        self.locus_step = step
+        self.spectral_locus = self.calc_spectral_locus()
+        self.invalidate_background()
 
-    def draw_sRGB_gamut(self, painter: QPainter) -> None:
-        # Coordinates of the 3 primary colors on the chromaticity diagram
-        # (red, green, blue in order)
-        primary_colors_coords = [(0.64, 0.33), (0.3, 0.6), (0.15, 0.06)]
-        painter.setBrush(QBrush(QColor(0, 0, 0)))
-        painter.setPen(QPen(QColor(0, 0, 0)))
+    def draw_gamuts(self, painter: QPainter) -> None:
+        for name in self.gamuts:
+            self.draw_gamut(painter, get_gamut(name), label=len(self.gamuts) > 1)
 
-        for x, y in primary_colors_coords:
+    def draw_gamut(self, painter: QPainter, gamut: Gamut, label: bool = False) -> None:
+        """Draw the triangle of a gamut's primaries, optionally named next to
+        its green primary"""
+        color = QColor(*GAMUT_COLORS.get(gamut.name, (0, 0, 0)))
+        points = gamut.primaries * self.coord_scale
+        painter.save()
+        painter.setPen(QPen(color))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolygon(QPolygonF([QPointF(x, y) for x, y in points.tolist()]))
+        painter.setBrush(QBrush(color))
+        for x, y in gamut.primaries.tolist():
             self.draw_circle(painter, x, y, 2)
+        if label:
+            x, y = points[1].tolist()
+            painter.scale(1, -1)
+            font = painter.font()
+            font.setPointSize(8)
+            painter.setFont(font)
+            painter.drawText(QPointF(x + 6, -y - 4), gamut.name)
+        painter.restore()
 
-        lines = [
-            (primary_colors_coords[0], primary_colors_coords[1]),
-            (primary_colors_coords[1], primary_colors_coords[2]),
-            (primary_colors_coords[2], primary_colors_coords[0]),
-        ]
-        for (x1, y1), (x2, y2) in lines:
-            painter.drawLine(
-                x1 * self.coord_scale,
-                y1 * self.coord_scale,
-                x2 * self.coord_scale,
-                y2 * self.coord_scale,
-            )
+    def set_gamuts(self, names: List[str]) -> None:
+        """Overlay the named gamuts (see ``color.gamut.available_gamuts``)."""
+        for name in names:
+            get_gamut(name)
+        self.gamuts = list(names)
+        self.invalidate_background()
 
     def calc_current_RGB_val(self) -> Tuple[int, int, int]:
         xyz = self.calc_chromaticity_point_xyz_values()
@@ -191,8 +495,8 @@ class ChromaticityDiagramWidget(QWidget):
 
     def set_show_gamut(self, checked: bool) -> None:
         self.show_gamut = checked
-        self.update()
+        self.invalidate_background()
 
     def set_show_spectral_locus(self, checked: bool) -> None:
         self.show_spectral_locus = checked
-        self.update()
+        self.invalidate_background()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QImage, QPainter, QPixmap
+
+from color.diagram import rasterize_chromaticity_diagram
+from instrumentation import profiler
+from utils import DEFAULT_OBSERVER
+
+# Chromaticity bounding box of every standard observer's spectral locus;
+# tiles outside it are empty and never rendered
+LOCUS_BOUNDS = ((0.0, 0.0), (0.75, 0.85))
+
+
+class DiagramTileCache:
+    """LRU cache of rendered chromaticity diagram tiles.
+
+    Tiles are ``tile_size`` device pixels square and laid out on a grid
+    anchored at xy = (0, 0) for a given scale (device pixels per unit of
+    chromaticity), so panning reuses every tile already on screen and only
+    zooming or a resize renders new ones. Tiles are rendered with
+    ``rasterize_chromaticity_diagram`` at device resolution, so they stay
+    sharp on high-DPI screens.
+    """
+
+    def __init__(
+        self,
+        tile_size: int = 256,
+        max_tiles: int = 256,
+        observer: str = DEFAULT_OBSERVER,
+    ) -> None:
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.observer = observer
+        self._tiles: OrderedDict[Tuple[float, int, int], Optional[QPixmap]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def clear(self) -> None:
+        self._tiles.clear()
+
+    def set_observer(self, observer: str) -> None:
+        if observer != self.observer:
+            self.observer = observer
+            self.clear()
+
+    def tile(self, scale: float, column: int, row: int) -> Optional[QPixmap]:
+        """Tile covering device pixels [column, row] · tile_size at ``scale``.
+
+        Device y grows downwards, so row r spans y ∈ [−(r+1), −r] · size /
+        scale. Returns None for tiles outside the locus.
+        """
+        key = (scale, column, row)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+
+        span = self.tile_size / scale
+        x_range = (column * span, (column + 1) * span)
+        y_range = (-(row + 1) * span, -row * span)
+        (x_min, y_min), (x_max, y_max) = LOCUS_BOUNDS
+        pixmap = None
+        if x_range[1] > x_min and x_range[0] < x_max:
+            if y_range[1] > y_min and y_range[0] < y_max:
+                with profiler.timer("chromaticity.render_tile"):
+                    pixmap = self._render(x_range, y_range)
+
+        self._tiles[key] = pixmap
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return pixmap
+
+    def _render(
+        self, x_range: Tuple[float, float], y_range: Tuple[float, float]
+    ) -> QPixmap:
+        size = self.tile_size
+        pixels = rasterize_chromaticity_diagram(
+            size, size, x_range, y_range, self.observer
+        )
+        image = QImage(pixels.data, size, size, 4 * size, QImage.Format_RGBA8888)
+        # fromImage copies the pixels before the array goes away
+        return QPixmap.fromImage(image)
+
+    def draw(
+        self,
+        painter: QPainter,
+        origin: QPointF,
+        scale: float,
+        pixel_ratio: float,
+        width: float,
+        height: float,
+    ) -> None:
+        """Draw the tiles covering a ``width`` × ``height`` logical area.
+
+        ``origin`` is the logical position of xy = (0, 0) and ``scale`` the
+        logical pixels per unit of chromaticity; both are rounded to whole
+        device pixels so tiles meet without seams.
+        """
+        size = self.tile_size
+        device_scale = round(scale * pixel_ratio, 6)
+        origin_x = round(origin.x() * pixel_ratio)
+        origin_y = round(origin.y() * pixel_ratio)
+        first_column = -origin_x // size
+        first_row = -origin_y // size
+        last_column = (round(width * pixel_ratio) - origin_x) // size
+        last_row = (round(height * pixel_ratio) - origin_y) // size
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                pixmap = self.tile(device_scale, column, row)
+                if pixmap is None:
+                    continue
+                pixmap.setDevicePixelRatio(pixel_ratio)
+                painter.drawPixmap(
+                    QPointF(
+                        (origin_x + column * size) / pixel_ratio,
+                        (origin_y + row * size) / pixel_ratio,
+                    ),
+                    pixmap,
+                )
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 from PySide6.QtCore import QPointF, Qt, Signal
-from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap
-from PySide6.QtWidgets import QMenu, QWidget
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap, QPolygonF
+from PySide6.QtWidgets import QFileDialog, QMenu, QMessageBox, QWidget
 
-from numerics.bezier import eval_bezier_curve
-from numerics.spectral import calc_XYZ_from_bezier
-from utils import load_color_matching_funcs
+from instrumentation import profiler
+from numerics.bezier import IncrementalBezier
+from numerics.control_points import EPS, ControlPointStore, clamp_between
+from numerics.fitting import get_bezier_fitter
+from numerics.spectral import get_integrator
+from utils import load_color_matching_funcs, load_measured_spectrum
 
-EPS = 1e-5
+from .xyz_worker import XYZWorker
+
+# Control points of curves fitted to measured spectra, and the height of
+# their peak as a fraction of the y axis
+FIT_POINTS = 30
+MEASURED_PEAK = 0.9
+# Relative RMS residual above which a fitted spectrum is reported as poor;
+# peaks much narrower than the curve's resolution end up flattened
+FIT_WARN_RESIDUAL = 0.2
 
 
 class SpectralDistributionWidget(QWidget):
@@ -19,12 +30,9 @@ class SpectralDistributionWidget(QWidget):
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self.bezier_control_points: List[Tuple[float, float]] = [
-            (0.084, 0.0),
-            (0.18, 0.5),
-            (0.33, 0.12),
-            (0.93, 0.0),
-        ]
+        self.bezier_control_points = ControlPointStore(
+            [(0.084, 0.0), (0.18, 0.5), (0.33, 0.12), (0.93, 0.0)]
+        )
         self.margin: int = 50
 
         self.wavelengths, self.cmfs_values = load_color_matching_funcs()
@@ -33,21 +41,50 @@ class SpectralDistributionWidget(QWidget):
         self._hit_radius_px: int = 8
         self.setMouseTracking(True)
         self.background: Optional[QPixmap] = None
+        # Samples of the drawn curve, updated by deltas while dragging
+        self.curve = IncrementalBezier(samples=100)
+        # Control and curve polygons in drawing coordinates, rebuilt only
+        # when the points or the axis lengths change
+        self._polygons: Tuple[QPolygonF, QPolygonF] = (QPolygonF(), QPolygonF())
+        self._polygons_key: Tuple[int, int, int] = (-1, 0, 0)
+
+        self.xyz_worker = XYZWorker(self.wavelengths, self.cmfs_values, self)
+        self.xyz_worker.XYZReady.connect(self.XYZChanged)
+        # Child widgets get no closeEvent when the window closes
+        self.destroyed.connect(self.xyz_worker.shutdown)
+        self.calc_XYZ()
+
+    def closeEvent(self, event) -> None:
+        self.xyz_worker.shutdown()
+        super().closeEvent(event)
 
     def paintEvent(self, event) -> None:
         painter = QPainter(self)
         try:
-            self.setup_painter(painter)
-            if self.background is None:
-                self.draw_background()
-            else:
-                painter.drawPixmap(0, 0, self.background)
-            self.setup_coord_system_origin(painter)
-            self.draw_bezier_curve(painter)
-            self.calc_XYZ()
+            with profiler.timer("spectral.paint"):
+                self.setup_painter(painter)
+                if self.background is None:
+                    self.draw_background()
+                else:
+                    painter.drawPixmap(0, 0, self.background)
+                painter.save()
+                self.setup_coord_system_origin(painter)
+                self.draw_bezier_curve(painter)
+                painter.restore()
+            if profiler.overlay:
+                self.draw_profiler_overlay(painter)
         finally:
             painter.end()
 
+    def draw_profiler_overlay(self, painter: QPainter) -> None:
+        text = (
+            f"frame {profiler.last_ms('spectral.paint'):.2f} ms   "
+            f"diagram {profiler.last_ms('chromaticity.paint'):.2f} ms   "
+            f"XYZ {profiler.last_ms('xyz.compute'):.2f} ms"
+        )
+        painter.setPen(QPen(QColor(200, 0, 0)))
+        painter.drawText(self.margin, 15, text)
+
     def setup_painter(self, painter: QPainter) -> None:
         painter.setRenderHint(QPainter.Antialiasing)
 
@@ -127,36 +164,37 @@ class SpectralDistributionWidget(QWidget):
             painter.drawPath(path)
 
     def draw_bezier_curve(self, painter: QPainter) -> None:
-        samples = 100
-        curve_points = eval_bezier_curve(self.bezier_control_points, samples)
+        x_axis_length, y_axis_length = self.calc_axis_lengths()
+        key = (self.bezier_control_points.version, x_axis_length, y_axis_length)
+        if key != self._polygons_key:
+            scale = (x_axis_length, y_axis_length)
+            curve = self.curve.sync(self.bezier_control_points) * scale
+            control_points = self.bezier_control_points.points * scale
+            self._polygons = (
+                QPolygonF([QPointF(x, y) for x, y in control_points.tolist()]),
+                QPolygonF([QPointF(x, y) for x, y in curve.tolist()]),
+            )
+            self._polygons_key = key
+        polygon, curve_polygon = self._polygons
 
         # Drawing the control polygon
         painter.setPen(QPen(QColor(122, 130, 122), 1))
-        for p1, p2 in zip(self.bezier_control_points, self.bezier_control_points[1:]):
-            painter.drawLine(
-                self.scale_norm_to_widget(p1), self.scale_norm_to_widget(p2)
-            )
+        painter.drawPolyline(polygon)
 
         # Drawing the curve
         painter.setPen(QPen(QColor(0, 0, 0), 2))
-        path = QPainterPath()
-        first_point = self.scale_norm_to_widget(curve_points[0])
-        path.moveTo(first_point)
-        for point in curve_points[1:]:
-            path.lineTo(self.scale_norm_to_widget(point))
-        painter.drawPath(path)
+        painter.drawPolyline(curve_polygon)
 
         # Drawing control points
         painter.setBrush(QColor(237, 105, 240))
         painter.setPen(QPen(QColor(237, 105, 240), 2))
-        for p in self.bezier_control_points:
-            painter.drawEllipse(self.scale_norm_to_widget(p), 3, 3)
+        for p in polygon:
+            painter.drawEllipse(p, 3, 3)
 
     def calc_XYZ(self) -> None:
-        XYZ = calc_XYZ_from_bezier(
-            self.bezier_control_points, self.wavelengths, self.cmfs_values
-        )
-        self.XYZChanged.emit(XYZ)
+        """Request XYZ of the current curve; ``XYZChanged`` is emitted once
+        the background worker finishes and only if the control points changed"""
+        self.xyz_worker.request(self.bezier_control_points)
 
     def transform_to_widget(self, point: QPointF) -> QPointF:
         """Transform a point from the widget's default coordinate system to the
@@ -166,25 +204,15 @@ class SpectralDistributionWidget(QWidget):
         return QPointF(x, y)
 
     def control_point_hit_test(self, mouse_pos: QPointF) -> Optional[int]:
-        candidates: list[int] = []
-        widget_control_points = [
-            self.scale_norm_to_widget(cp) for cp in self.bezier_control_points
-        ]
-        for i, cp in enumerate(widget_control_points):
-            if (
-                abs(cp.x() - mouse_pos.x()) <= self._hit_radius_px
-                and abs(cp.y() - mouse_pos.y()) <= self._hit_radius_px
-            ):
-                candidates.append(i)
-
-        if not candidates:
-            return None
-
-        n = len(self.bezier_control_points)
-        inner = [i for i in candidates if i not in (0, n - 1)]
-        if inner:
-            return max(inner)
-        return max(candidates)
+        x_axis_length, y_axis_length = self.calc_axis_lengths()
+        x_axis_length = max(x_axis_length, 1)
+        y_axis_length = max(y_axis_length, 1)
+        return self.bezier_control_points.hit_test(
+            mouse_pos.x() / x_axis_length,
+            mouse_pos.y() / y_axis_length,
+            self._hit_radius_px / x_axis_length,
+            self._hit_radius_px / y_axis_length,
+        )
 
     def resizeEvent(self, event) -> None:
         super().resizeEvent(event)
@@ -192,29 +220,12 @@ class SpectralDistributionWidget(QWidget):
 
     def enforce_moving_point_position(self, x: float, y: float, point_index: int):
         """Enforce point position while moving so the Bézier curve remains
-        a properly defined function"""
-        n = len(self.bezier_control_points)
-        if n < 2:
+        a properly defined function: x stays strictly between the
+        neighbours (EPS away when there is room), end points inside
+        [EPS, 1 - EPS]"""
+        if len(self.bezier_control_points) < 2:
             return (x, y)
-
-        # Left endpoint — keep it within (>= EPS, <= neighbor_x - EPS)
-        if point_index == 0:
-            right_cp_x = self.bezier_control_points[1][0]
-            x = max(EPS, min(x, right_cp_x - EPS))
-        # Right endpoint — keep it within (>= neighbor_x + EPS, <= 1 - EPS)
-        elif point_index == n - 1:
-            left_cp_x = self.bezier_control_points[n - 2][0]
-            x = min(1.0 - EPS, max(x, left_cp_x + EPS))
-        # Inner points — always between neighbors
-        else:
-            left_cp_x = self.bezier_control_points[point_index - 1][0]
-            right_cp_x = self.bezier_control_points[point_index + 1][0]
-            if x <= left_cp_x:
-                x = left_cp_x + EPS
-            if x >= right_cp_x:
-                x = right_cp_x - EPS
-
-        return (x, y)
+        return (self.bezier_control_points.clamp_x(point_index, x, EPS), y)
 
     def mousePressEvent(self, event) -> None:
         if event.button() != Qt.LeftButton:
@@ -233,7 +244,8 @@ class SpectralDistributionWidget(QWidget):
         if self._dragging_index in (0, len(self.bezier_control_points) - 1):
             y = 0.0
 
-        self.bezier_control_points[self._dragging_index] = (x, y)
+        self.bezier_control_points.move(self._dragging_index, x, y)
+        self.calc_XYZ()
         self.update()
 
     def mouseReleaseEvent(self, event) -> None:
@@ -259,21 +271,25 @@ class SpectralDistributionWidget(QWidget):
             del_cp_action = menu.addAction("Delete control point")
         else:
             add_cp_action = menu.addAction("Add control point")
+        menu.addSeparator()
+        load_action = menu.addAction("Load measured spectrum...")
         chosen = menu.exec(event.globalPos())
+        if chosen is not None and chosen is load_action:
+            self.open_measured_spectrum()
+            return
         if chosen is not None and add_cp_action is not None and chosen is add_cp_action:
             x, y = self.scale_widget_to_norm(mouse_pos)
-            # Insert point keeping list ordered by x
-            cps = list(self.bezier_control_points)
-            insert_idx = 1
-            while insert_idx < len(cps) - 1 and cps[insert_idx][0] <= x:
-                insert_idx += 1
+            # Insert point keeping points ordered by x
+            cps = self.bezier_control_points
+            insert_idx = cps.insertion_index(x)
             # Force the new point between neighbors so it does not overlap by X
-            # with existing points
+            # with existing points; there is no room between points closer
+            # than 2 * EPS
             prev_x = cps[insert_idx - 1][0]
             next_x = cps[insert_idx][0]
-            x = max(prev_x + EPS, min(x, next_x - EPS))
-            cps.insert(insert_idx, (x, y))
-            self.bezier_control_points = cps
+            if next_x - prev_x >= 2 * EPS:
+                x = clamp_between(x, prev_x, next_x, EPS)
+                cps.insert(insert_idx, x, y)
         elif (
             chosen is not None
             and del_cp_action is not None
@@ -282,10 +298,65 @@ class SpectralDistributionWidget(QWidget):
         ):
             n = len(self.bezier_control_points)
             if n > 2 and cp_idx not in (0, n - 1):
-                del self.bezier_control_points[cp_idx]
+                self.bezier_control_points.delete(cp_idx)
 
+        self.calc_XYZ()
         self.update()
 
+    def open_measured_spectrum(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Load measured spectrum",
+            "",
+            "Spectra (*.csv *.txt *.tsv *.npy);;All files (*)",
+        )
+        if not path:
+            return
+        try:
+            residual = self.load_spectrum(*load_measured_spectrum(path))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Load measured spectrum", str(e))
+            return
+        if residual > FIT_WARN_RESIDUAL:
+            QMessageBox.warning(
+                self,
+                "Load measured spectrum",
+                f"The curve deviates from the spectrum by {residual:.0%} (RMS); "
+                "narrow peaks cannot be followed by the fitted curve.",
+            )
+
+    def load_spectrum(
+        self, wavelengths: np.ndarray, values: np.ndarray, n_points: int = FIT_POINTS
+    ) -> float:
+        """Replace the curve by a least-squares fit of a measured spectrum.
+
+        The spectrum is scaled so its peak sits at ``MEASURED_PEAK`` of the
+        y axis; only its shape matters for the chromaticity. Returns the RMS
+        residual of the fit relative to the RMS of the spectrum.
+        """
+        values = np.asarray(values, dtype=float)
+        peak = values.max()
+        if not peak > 0:
+            raise ValueError("The spectrum has no positive values")
+        y_span = self.cmfs_values.max() - self.cmfs_values.min()
+        values = values * (MEASURED_PEAK * y_span / peak)
+        fitter = get_bezier_fitter(
+            wavelengths, n_points, get_integrator(self.wavelengths, self.cmfs_values)
+        )
+        # Keep the points inside the drawn coordinate system
+        control_points = fitter.fit(values, bounds=(0.0, 1.0))
+        # The end points span the measured range, which may reach the
+        # borders the editor keeps every point away from
+        control_points[0, 0] = max(control_points[0, 0], EPS)
+        control_points[-1, 0] = min(control_points[-1, 0], 1 - EPS)
+        self.bezier_control_points.set_points(control_points)
+        self.calc_XYZ()
+        self.update()
+        residual = fitter.residuals(values, control_points)
+        return float(
+            np.linalg.norm(residual) / np.linalg.norm(values[..., fitter.mask])
+        )
+
     def draw_axis_ticks_and_labels(
         self, painter: QPainter, x_axis_length: int, y_axis_length: int
     ):
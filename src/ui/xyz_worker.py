@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from instrumentation import profiler
+from numerics.control_points import ControlPointStore
+from numerics.spectral import IncrementalSpectrumXYZ, get_integrator
+
+logger = logging.getLogger(__name__)
+
+
+class XYZWorker(QObject):
+    """Computes XYZ of Bézier spectra off the GUI thread.
+
+    At most one computation runs at a time. Requests arriving meanwhile are
+    coalesced so only the latest control point state is computed next, and
+    results of superseded requests are dropped instead of emitted. XYZ is
+    kept incrementally, so dragging a single control point only applies
+    that point's delta.
+
+    Requests are recognized as unchanged by the store's version stamp. The
+    executor thread works on its own replica of the points, which a
+    snapshot copy brings up to date, so the GUI thread can keep editing
+    the store in place.
+    """
+
+    XYZReady = Signal(list)
+    # Emitted from the executor thread; delivered on the GUI thread
+    _computed = Signal(int, list)
+
+    def __init__(
+        self,
+        wavelengths: np.ndarray,
+        cmfs_values: np.ndarray,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.wavelengths = wavelengths
+        self.cmfs_values = cmfs_values
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Only touched on the executor thread
+        self._spectrum = IncrementalSpectrumXYZ(
+            get_integrator(wavelengths, cmfs_values)
+        )
+        self._replica = ControlPointStore()
+        self._generation: int = 0
+        self._in_flight: bool = False
+        self._pending: Optional[Tuple[int, np.ndarray]] = None
+        self._last_requested: Optional[Tuple[ControlPointStore, int]] = None
+        self._computed.connect(self._on_computed)
+
+    def request(self, control_points: ControlPointStore) -> None:
+        """Schedule XYZ computation unless the control points are unchanged."""
+        state = (control_points, control_points.version)
+        if state == self._last_requested:
+            return
+        profiler.count("xyz.requests")
+        self._last_requested = state
+        self._generation += 1
+        self._pending = (self._generation, control_points.copy())
+        if not self._in_flight:
+            self._submit_pending()
+
+    def shutdown(self) -> None:
+        """Drop pending requests and stop the executor thread."""
+        self._pending = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_pending(self) -> None:
+        generation, control_points = self._pending
+        self._pending = None
+        self._in_flight = True
+        self._executor.submit(self._compute, generation, control_points)
+
+    def _compute(self, generation: int, control_points: np.ndarray) -> None:
+        # An empty list marks a failed computation
+        XYZ: List[float] = []
+        try:
+            with profiler.timer("xyz.compute"):
+                self._replica.assign(control_points)
+                XYZ = self._spectrum.sync(self._replica).tolist()
+        except Exception:
+            # Nobody waits on the future, so report the failure here
+            profiler.count("xyz.failed")
+            logger.exception("XYZ computation failed")
+        finally:
+            self._computed.emit(generation, XYZ)
+
+    def _on_computed(self, generation: int, XYZ: List[float]) -> None:
+        self._in_flight = False
+        # Results of superseded requests are stale
+        if XYZ and generation == self._generation:
+            # Directly connected slots run inside emit, so this times the
+            # whole XYZChanged -> set_XYZ -> colorChanged chain
+            with profiler.timer("signal.XYZChanged"):
+                self.XYZReady.emit(XYZ)
+        else:
+            profiler.count("xyz.dropped")
+        if self._pending is not None:
+            self._submit_pending()
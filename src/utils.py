@@ -1,29 +1,411 @@
+import hashlib
+import mmap
+import os
+import threading
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
+# Binary copies of parsed text tables live here, next to their sources
+CACHE_DIR_NAME = ".cache"
 
-def load_color_matching_funcs() -> Tuple[np.ndarray, np.ndarray]:
+DEFAULT_OBSERVER = "CIE 1931 2°"
+
+SPECTRAL_LIBRARY_FORMATS = ("npy", "raw", "text")
+
+
+class ObserverDataset:
+    """Color matching functions of one standard observer.
+
+    The table is a file with rows ``λ x̄ ȳ z̄`` (text, or ``.npy`` of shape
+    (N, 4)) that is only loaded, memory-mapped, on first access.
+    Resampled copies are computed once per target grid and shared. The
+    column views are built once per loaded table, so callers get the same
+    array objects back and integrators can be looked up by identity.
+    """
+
+    def __init__(self, name: str, file_path: Path, description: str = "") -> None:
+        self.name = name
+        self.file_path = Path(file_path)
+        self._resolved_path: Optional[str] = None
+        self.description = description
+        self._resampled: Dict[bytes, Tuple[np.ndarray, np.ndarray]] = {}
+        # Table the column views below were taken from
+        self._columns: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> np.ndarray:
+        if self._resolved_path is None:
+            self._resolved_path = str(self.file_path.resolve())
+        return _load_resolved_table(self._resolved_path)
+
+    @property
+    def wavelengths(self) -> np.ndarray:
+        return self.columns()[0]
+
+    @property
+    def cmfs_values(self) -> np.ndarray:
+        return self.columns()[1]
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Wavelengths (N,) and CMF values (N, 3) as views of the table.
+
+        The same views are returned until the source file changes.
+        """
+        table = self.table
+        columns = self._columns
+        if columns is None or columns[0] is not table:
+            columns = (table, table[:, 0], table[:, 1:4])
+            self._columns = columns
+        return columns[1], columns[2]
+
+    def resample(self, grid: np.ndarray) -> np.ndarray:
+        """CMF values linearly interpolated onto ``grid`` (0 outside the table).
+
+        Returns a read-only (len(grid), 3) array cached per grid.
+        """
+        return self.resample_table(grid)[1]
+
+    def resample_table(self, grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only copy of ``grid`` and the CMF values resampled onto it,
+        both cached per grid."""
+        grid = np.ascontiguousarray(grid, dtype=float)
+        key = hashlib.blake2b(grid.tobytes(), digest_size=16).digest()
+        with self._lock:
+            entry = self._resampled.get(key)
+            if entry is None:
+                wavelengths, cmfs_values = self.wavelengths, self.cmfs_values
+                values = np.column_stack(
+                    [
+                        np.interp(grid, wavelengths, cmfs_values[:, i], 0.0, 0.0)
+                        for i in range(3)
+                    ]
+                )
+                values.setflags(write=False)
+                grid = grid.copy()
+                grid.setflags(write=False)
+                entry = (grid, values)
+                self._resampled[key] = entry
+        return entry
+
+
+_observers: Dict[str, ObserverDataset] = {}
+
+
+def register_observer(
+    name: str, file_path: Path, description: str = "", replace: bool = False
+) -> ObserverDataset:
+    """Make a CMF table selectable by ``name``, e.g. a 10° or 0.1 nm table."""
+    if name in _observers and not replace:
+        raise ValueError(f"Observer already registered: {name}")
+    dataset = ObserverDataset(name, file_path, description)
+    _observers[name] = dataset
+    return dataset
+
+
+def get_observer(name: str = DEFAULT_OBSERVER) -> ObserverDataset:
+    try:
+        return _observers[name]
+    except KeyError:
+        available = ", ".join(available_observers())
+        raise KeyError(f"Unknown observer {name!r}; available: {available}") from None
+
+
+def available_observers() -> List[str]:
+    return sorted(_observers)
+
+
+def load_color_matching_funcs(
+    observer: str = DEFAULT_OBSERVER, grid: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """Load CIE color matching functions values.
 
+    The returned arrays are read-only and shared by every caller in the
+    process; see ``load_spectral_table``.
+
+    Parameters
+    ----------
+    observer : str
+        Name of a registered observer dataset.
+    grid : np.ndarray, optional
+        Wavelength grid (nm) to resample onto; defaults to the table's own.
+
     Returns
     -------
     tuple[np.ndarray, np.ndarray]
         Tuple (wavelengths_nm, xyz) where wavelengths are in nm and
         xyz has shape (N, 3).
     """
-    file_path = get_path_from_resources("color_matching_functions.txt")
+    dataset = get_observer(observer)
+    if grid is None:
+        return dataset.columns()
+    return dataset.resample_table(grid)
+
+
+def load_spectral_table(file_path: Path) -> np.ndarray:
+    """Load a whitespace-separated numeric table through a binary cache.
+
+    ``.npy`` files are memory-mapped directly. Any other file is parsed
+    once and stored as ``.npy`` in a ``.cache`` directory next to it; later
+    loads memory-map that file instead. The
+    cache file name encodes the source size and modification time, so
+    editing the source invalidates it. Within a process the same read-only
+    array is returned for every call.
+    """
+    return _load_resolved_table(str(Path(file_path).resolve()))
 
+
+def _load_resolved_table(file_path: str) -> np.ndarray:
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data file not found: {file_path}") from None
+    if file_path.endswith(".npy"):
+        return _load_npy_table(file_path)
+    return _load_cached_table(file_path, stat.st_size, stat.st_mtime_ns)
+
+
+def load_measured_spectrum(file_path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Load a measured SPD with rows ``λ value`` (nm, any unit).
+
+    Text files may separate columns by commas, semicolons or whitespace;
+    rows that do not start with two numbers (headers, comments) are
+    skipped. ``.npy`` files hold an (N, 2) array. Rows are returned sorted
+    by wavelength.
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Data file not found: {file_path}")
+    if file_path.suffix == ".npy":
+        table = np.load(file_path).astype(float).reshape(-1, 2)
+    else:
+        rows: List[Tuple[float, float]] = []
+        with open(file_path) as f:
+            for line in f:
+                fields = line.replace(",", " ").replace(";", " ").split()
+                try:
+                    rows.append((float(fields[0]), float(fields[1])))
+                except (IndexError, ValueError):
+                    continue
+        table = np.array(rows, dtype=float).reshape(-1, 2)
+    if len(table) < 2:
+        raise ValueError(f"No spectrum samples found in {file_path}")
+    table = table[np.argsort(table[:, 0], kind="stable")]
+    if np.any(np.diff(table[:, 0]) == 0):
+        raise ValueError(f"Repeated wavelengths in {file_path}")
+    return table[:, 0], table[:, 1]
+
+
+def spectral_library_format(file_path: Path) -> str:
+    """Format of a spectral library file inferred from its suffix."""
+    suffix = Path(file_path).suffix.lower()
+    if suffix == ".npy":
+        return "npy"
+    if suffix in (".raw", ".bin"):
+        return "raw"
+    return "text"
+
+
+def iter_spectral_library(
+    file_path: Path,
+    chunk_size: int = 4096,
+    fmt: Optional[str] = None,
+    record_length: Optional[int] = None,
+    dtype: str = "<f8",
+    offset: int = 0,
+) -> Iterator[np.ndarray]:
+    """Stream the spectra of a library file in chunks.
+
+    Every record is one SPD sampled on a shared wavelength grid; chunks are
+    float arrays of shape (≤ chunk_size, M). Only about one chunk is held
+    in memory at a time, whatever the size of the file:
+
+    npy, raw
+        The file is memory-mapped and sliced, and the pages of chunks
+        already handed out are dropped from the mapping, so resident
+        memory does not grow with the file either. ``.npy`` arrays must be
+        2-D (Fortran-ordered ones are sliced without dropping pages). Raw
+        files hold C-ordered records of
+        ``record_length`` values of ``dtype`` after ``offset`` header bytes.
+    text
+        Parsed ``chunk_size`` lines at a time with ``np.loadtxt``. Columns
+        are separated by commas, semicolons or whitespace (detected from
+        the first line); a non-numeric first line is skipped as a header,
+        as are blank lines and ``#`` comments.
+
+    ``fmt`` defaults to ``spectral_library_format`` of the path.
+    """
+    file_path = Path(file_path)
     if not file_path.exists():
         raise FileNotFoundError(f"Data file not found: {file_path}")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    fmt = fmt or spectral_library_format(file_path)
+    if fmt == "text":
+        yield from _iter_text_records(file_path, chunk_size)
+        return
+    if fmt == "npy":
+        with open(file_path, "rb") as f:
+            if np.lib.format.read_magic(f) == (1, 0):
+                header = np.lib.format.read_array_header_1_0(f)
+            else:
+                header = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        shape, fortran_order, record_dtype = header
+        if len(shape) != 2:
+            raise ValueError(f"Expected a 2-D array in {file_path}")
+        if fortran_order:
+            # Records are not contiguous in the file; slice numpy's own map
+            data = np.load(file_path, mmap_mode="r")
+            for start in range(0, len(data), chunk_size):
+                yield np.asarray(data[start : start + chunk_size], dtype=float)
+            return
+        count, record_length = shape
+    elif fmt == "raw":
+        if record_length is None or record_length < 1:
+            raise ValueError("Raw spectral libraries need a record length")
+        record_dtype = np.dtype(dtype)
+        size = file_path.stat().st_size - offset
+        record_bytes = record_length * record_dtype.itemsize
+        if size < 0 or size % record_bytes:
+            raise ValueError(
+                f"{file_path} does not hold whole records of {record_length} "
+                f"{record_dtype} values"
+            )
+        count = size // record_bytes
+    else:
+        raise ValueError(
+            f"Unknown spectral library format {fmt!r}; "
+            f"available: {', '.join(SPECTRAL_LIBRARY_FORMATS)}"
+        )
+    if count == 0 or record_length == 0:
+        return
+    yield from _iter_mapped_records(
+        file_path, np.dtype(record_dtype), offset, count, record_length, chunk_size
+    )
 
-    wavelenghts = np.loadtxt(file_path, usecols=0, dtype=float)
-    xyz = np.loadtxt(file_path, usecols=(1, 2, 3), dtype=float)
 
-    return (wavelenghts, xyz)
+def _iter_mapped_records(
+    file_path: Path,
+    dtype: np.dtype,
+    offset: int,
+    count: int,
+    record_length: int,
+    chunk_size: int,
+) -> Iterator[np.ndarray]:
+    with open(file_path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    records = np.frombuffer(
+        mapping, dtype=dtype, count=count * record_length, offset=offset
+    ).reshape(count, record_length)
+    record_bytes = record_length * dtype.itemsize
+    released = 0
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        yield np.asarray(records[start:stop], dtype=float)
+        # The mapping is read-only, so dropped pages are simply read again
+        # should the caller still access an earlier chunk
+        end = (offset + stop * record_bytes) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > released and hasattr(mapping, "madvise"):
+            mapping.madvise(mmap.MADV_DONTNEED, released, end - released)
+            released = end
+
+
+def _iter_text_records(file_path: Path, chunk_size: int) -> Iterator[np.ndarray]:
+    with open(file_path) as f:
+        lines: Iterable[str] = (
+            line for line in f if line.strip() and not line.lstrip().startswith("#")
+        )
+        first = next(iter(lines), None)
+        if first is None:
+            return
+        delimiter = "," if "," in first else ";" if ";" in first else None
+        if delimiter is not None:
+            # Tolerate a trailing separator, as spreadsheet exports write it
+            lines = (line.rstrip().rstrip(delimiter) for line in lines)
+            first = first.rstrip().rstrip(delimiter)
+        if not _is_header(first.split(delimiter)):
+            lines = chain([first], lines)
+        width = None
+        while True:
+            block = list(islice(lines, chunk_size))
+            if not block:
+                return
+            chunk = np.loadtxt(block, dtype=float, delimiter=delimiter, ndmin=2)
+            if width is not None and chunk.shape[1] != width:
+                raise ValueError(
+                    f"Records in {file_path} have {chunk.shape[1]} values, "
+                    f"expected {width}"
+                )
+            width = chunk.shape[1]
+            yield chunk
+
+
+def _is_header(fields: List[str]) -> bool:
+    """Whether a first text line has non-numeric fields, i.e. is a header."""
+    for field in fields:
+        try:
+            float(field)
+        except ValueError:
+            return True
+    return False
+
+
+def get_table_cache_path(file_path: Path, size: int, mtime_ns: int) -> Path:
+    return file_path.parent / CACHE_DIR_NAME / f"{file_path.stem}-{size}-{mtime_ns}.npy"
+
+
+@lru_cache(maxsize=None)
+def _load_npy_table(file_path: str) -> np.ndarray:
+    return np.load(file_path, mmap_mode="r")
+
+
+@lru_cache(maxsize=None)
+def _load_cached_table(file_path: str, size: int, mtime_ns: int) -> np.ndarray:
+    source = Path(file_path)
+    cache_path = get_table_cache_path(source, size, mtime_ns)
+    if cache_path.exists():
+        try:
+            return np.load(cache_path, mmap_mode="r")
+        except (OSError, ValueError):
+            # Corrupted or truncated cache; fall through and rebuild it
+            pass
+
+    table = np.loadtxt(source, dtype=float, ndmin=2)
+    try:
+        _write_table_cache(cache_path, table)
+        return np.load(cache_path, mmap_mode="r")
+    except OSError:
+        # Read-only resources directory: keep the parsed array in memory
+        table.setflags(write=False)
+        return table
+
+
+def _write_table_cache(cache_path: Path, table: np.ndarray) -> None:
+    cache_path.parent.mkdir(exist_ok=True)
+    # Caches of previous versions of the same source are stale
+    stem = cache_path.stem.rsplit("-", 2)[0]
+    for stale in cache_path.parent.glob(f"{stem}-*-*.npy"):
+        # The glob also matches other sources such as "cie-1964"
+        if stale != cache_path and stale.stem.rsplit("-", 2)[0] == stem:
+            stale.unlink(missing_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, cache_path)
 
 
 def get_path_from_resources(relative_path: str) -> Path:
     project_dir = Path(__file__).resolve().parent.parent
     return project_dir / "resources" / relative_path
+
+
+register_observer(
+    DEFAULT_OBSERVER,
+    get_path_from_resources("color_matching_functions.txt"),
+    "CIE 1931 2° standard observer, 380–780 nm at 1 nm",
+)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules live on the src path, as when running src/main.py or src/cli.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
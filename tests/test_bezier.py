@@ -0,0 +1,18 @@
+import numpy as np
+
+from numerics.bezier import de_casteljau_eval, solve_bezier_x
+
+
+def test_solve_bezier_x_batch_matches_single_curves():
+    rng = np.random.default_rng(0)
+    control_points = rng.random((8, 6, 2))
+    control_points[..., 0] = np.sort(control_points[..., 0], axis=1)
+    targets = np.linspace(0.0, 1.0, 101)
+    t = solve_bezier_x(control_points, targets)
+    for curve, row in zip(control_points, t):
+        np.testing.assert_allclose(solve_bezier_x(curve, targets), row, atol=1e-12)
+        x, _ = de_casteljau_eval(curve[:, 0], row)
+        inside = (targets >= curve[0, 0]) & (targets <= curve[-1, 0])
+        np.testing.assert_allclose(x[inside], targets[inside], atol=1e-10)
+        assert np.all(row[targets < curve[0, 0]] == 0.0)
+        assert np.all(row[targets > curve[-1, 0]] == 1.0)
@@ -0,0 +1,15 @@
+import numpy as np
+
+import cli
+from utils import load_color_matching_funcs
+
+
+def test_trailing_comma_spectra_keep_one_output_row_each(tmp_path):
+    wavelengths, _ = load_color_matching_funcs()
+    spectra = np.random.default_rng(0).random((5, len(wavelengths)))
+    source = tmp_path / "spectra.csv"
+    source.write_text("".join(",".join(map(str, row)) + ",\n" for row in spectra))
+    output = tmp_path / "out.csv"
+    assert cli.main([str(source), "--kind", "spectra", "-o", str(output)]) == 0
+    rows = np.loadtxt(output, delimiter=",", skiprows=1, ndmin=2)
+    assert len(rows) == len(spectra)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from numerics.control_points import ControlPointStore, clamp_between
+
+EPS = 1e-5
+
+
+def test_clamp_keeps_x_strictly_between_close_neighbours():
+    assert clamp_between(0.5, 0.2, 0.8, EPS) == 0.5
+    assert clamp_between(0.1, 0.2, 0.8, EPS) == pytest.approx(0.2 + EPS)
+    low, high = 0.084, 0.084 + EPS
+    x = clamp_between(0.0, low, high, EPS)
+    assert low < x < high
+
+
+def test_dragging_onto_a_neighbour_keeps_x_increasing():
+    store = ControlPointStore([(0.084, 0.0), (0.18, 0.5), (0.93, 0.0)])
+    store.move(1, store.clamp_x(1, 0.0, EPS), 0.5)
+    store.move(0, store.clamp_x(0, 1.0, EPS), 0.0)
+    assert np.all(np.diff(store.x) > 0)
+    assert store.clamp_x(2, 2.0, EPS) == pytest.approx(1 - EPS)
+
+
+def test_insert_rejects_duplicate_x():
+    store = ControlPointStore([(0.084, 0.0), (0.08401, 0.5), (0.93, 0.0)])
+    with pytest.raises(ValueError):
+        store.insert(1, 0.08401, 0.2)
+    with pytest.raises(ValueError):
+        store.insert(1, 0.084, 0.2)
+    assert len(store) == 3
+
+
+def test_assign_mirrors_points_without_reordering_checks():
+    replica = ControlPointStore()
+    points = np.array([[0.1, 0.0], [0.1, 0.5], [0.9, 0.0]])
+    replica.assign(points)
+    np.testing.assert_array_equal(replica.points, points)
+    points[1, 1] = 0.25
+    replica.assign(points)
+    assert replica.moved_since(replica.version - 1) == 1
+
+
+def test_insert_and_delete_keep_order_and_versions():
+    store = ControlPointStore([(0.1, 0.0), (0.5, 0.4), (0.9, 0.0)])
+    layout = store.layout_version
+    index = store.insertion_index(0.3)
+    assert index == 1
+    store.insert(index, 0.3, 0.2)
+    assert store.insertion_index(0.0) == 1
+    assert store.insertion_index(1.0) == len(store) - 1
+    store.insert(store.insertion_index(0.7), 0.7, 0.6)
+    np.testing.assert_array_equal(store.x, [0.1, 0.3, 0.5, 0.7, 0.9])
+    assert store.layout_version == layout + 2
+    store.delete(2)
+    np.testing.assert_array_equal(store.x, [0.1, 0.3, 0.7, 0.9])
+    assert store[2] == (0.7, 0.6)
+    with pytest.raises(IndexError):
+        store.delete(len(store))
+
+
+def test_hit_test_prefers_inner_points_over_end_points():
+    store = ControlPointStore([(0.1, 0.0), (0.4, 0.5), (0.6, 0.5), (0.9, 0.0)])
+    assert store.hit_test(0.41, 0.49, 0.02, 0.02) == 1
+    assert store.hit_test(0.5, 0.5, 0.02, 0.02) is None
+    assert store.hit_test(0.5, 0.5, 0.2, 0.02) == 2
+    # An inner point dragged onto an end point can still be picked up
+    store.move(1, store.clamp_x(1, 0.1, EPS), 0.0)
+    assert store.hit_test(0.1, 0.0, 0.01, 0.01) == 1
+    assert store.hit_test(0.9, 0.0, 0.01, 0.01) == 3
@@ -0,0 +1,18 @@
+import numpy as np
+
+from numerics.fitting import fit_bezier_to_spectrum
+from numerics.spectral import get_integrator
+from utils import load_color_matching_funcs
+
+
+def test_fit_round_trips_XYZ_of_a_smooth_spectrum():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    integrator = get_integrator(wavelengths, cmfs_values)
+    spectrum = np.exp(-0.5 * ((integrator.wavelengths - 560.0) / 60.0) ** 2)
+    control_points = fit_bezier_to_spectrum(
+        integrator.wavelengths, spectrum, wavelengths, cmfs_values, n_points=20
+    )
+    assert np.all(np.diff(control_points[:, 0]) > 0)
+    expected = integrator.integrate(spectrum)
+    XYZ = integrator.XYZ_from_bezier_exact(control_points[None])[0]
+    np.testing.assert_allclose(XYZ, expected, rtol=1e-2)
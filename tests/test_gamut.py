@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from color.gamut import MAPPING_METHODS, get_gamut
+
+
+@pytest.mark.parametrize("method", MAPPING_METHODS)
+def test_map_XYZ_sends_non_positive_Y_to_black(method):
+    XYZ = np.array([[0.5, -0.1, 0.5], [0.0, 0.0, 0.0]])
+    np.testing.assert_array_equal(get_gamut().map_XYZ(XYZ, method), 0.0)
+
+
+@pytest.mark.parametrize("method", MAPPING_METHODS)
+def test_map_XYZ_result_is_in_gamut(method):
+    gamut = get_gamut()
+    XYZ = np.array([[0.9, 0.2, 0.01], [0.2, 0.3, 0.1], [0.1, 0.8, 0.1]])
+    mapped = gamut.map_XYZ(XYZ, method)
+    assert gamut.contains_XYZ(mapped).all()
+    inside = gamut.contains_XYZ(XYZ)
+    np.testing.assert_allclose(mapped[inside], XYZ[inside])
@@ -0,0 +1,52 @@
+import numpy as np
+
+from numerics.control_points import EPS, ControlPointStore
+from numerics.inverse import (
+    get_spectrum_solver,
+    solve_bezier_for_XYZ,
+    solve_bezier_for_xy,
+)
+from numerics.spectral import get_integrator
+from utils import load_color_matching_funcs
+
+
+def test_reachable_XYZ_targets_converge():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    solver = get_spectrum_solver(get_integrator(wavelengths, cmfs_values))
+    rng = np.random.default_rng(0)
+    curves = np.zeros((6, solver.n_points, 2))
+    curves[..., 0] = solver.x
+    curves[:, 1:-1, 1] = rng.uniform(0.05, 0.6, (6, solver.n_points - 2))
+    targets = solver.XYZ(curves)
+    solution = solve_bezier_for_XYZ(targets, wavelengths, cmfs_values)
+    assert solution.converged.all()
+    np.testing.assert_allclose(solution.XYZ, targets, atol=1e-4 * np.abs(targets).max())
+
+
+def test_zero_target_is_the_zero_curve():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    solution = solve_bezier_for_XYZ(np.zeros(3), wavelengths, cmfs_values)
+    assert solution.converged
+    assert np.all(solution.control_points[:, 1] == 0.0)
+    dark = solve_bezier_for_xy(
+        np.array([0.3127, 0.329]), wavelengths, cmfs_values, luminance=0.0
+    )
+    assert dark.converged
+    np.testing.assert_array_equal(dark.XYZ, 0.0)
+
+
+def test_white_chromaticity_converges():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    white = np.array([0.3127, 0.329])
+    solution = solve_bezier_for_xy(white, wavelengths, cmfs_values)
+    assert solution.converged
+    XYZ = solution.XYZ
+    np.testing.assert_allclose(XYZ[:2] / XYZ.sum(), white, atol=1e-4)
+
+
+def test_solved_curves_load_into_the_editor_unchanged():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    solution = solve_bezier_for_xy(np.array([0.3127, 0.329]), wavelengths, cmfs_values)
+    store = ControlPointStore(solution.control_points)
+    for index, x in enumerate(store.x.tolist()):
+        assert store.clamp_x(index, x, EPS) == x
@@ -0,0 +1,43 @@
+import numpy as np
+
+from numerics import spectral
+from numerics.spectral import get_integrator, get_observer_integrator
+from utils import load_color_matching_funcs
+
+
+def test_integrator_is_shared_for_the_same_table():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    integrator = get_integrator(wavelengths, cmfs_values)
+    assert get_integrator(wavelengths, cmfs_values) is integrator
+    assert get_integrator(np.array(wavelengths), np.array(cmfs_values)) is integrator
+
+
+def test_writable_tables_are_not_cached_by_identity():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    cmfs_copy = np.array(cmfs_values)
+    before = get_integrator(wavelengths, cmfs_copy)
+    cmfs_copy *= 2
+    after = get_integrator(wavelengths, cmfs_copy)
+    assert after is not before
+    np.testing.assert_allclose(after.weights, 2 * before.weights)
+
+
+def test_observer_integrator_is_found_by_identity():
+    integrator = get_observer_integrator()
+    entries = len(spectral._integrators_by_id)
+    assert get_observer_integrator() is integrator
+    assert len(spectral._integrators_by_id) == entries
+    grid = np.arange(400.0, 701.0, 5.0)
+    on_grid = get_observer_integrator(grid=grid)
+    entries = len(spectral._integrators_by_id)
+    assert get_observer_integrator(grid=grid.copy()) is on_grid
+    assert len(spectral._integrators_by_id) == entries
+
+
+def test_identity_cache_is_bounded():
+    wavelengths, cmfs_values = load_color_matching_funcs()
+    for _ in range(3 * spectral.INTEGRATORS_BY_ID_SIZE):
+        w = np.array(wavelengths)
+        w.setflags(write=False)
+        get_integrator(w, cmfs_values)
+    assert len(spectral._integrators_by_id) <= spectral.INTEGRATORS_BY_ID_SIZE
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from utils import iter_spectral_library
+
+
+def read(path, **options):
+    return np.concatenate(list(iter_spectral_library(path, **options)))
+
+
+def test_trailing_comma_rows_are_all_read(tmp_path):
+    path = tmp_path / "library.csv"
+    path.write_text("1,2,3,\n4,5,6,\n7,8,9,\n")
+    np.testing.assert_array_equal(read(path), [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+
+def test_header_and_comments_are_skipped(tmp_path):
+    path = tmp_path / "library.csv"
+    path.write_text("nm380,nm381,\n# comment\n1,2,\n\n3,4,\n")
+    np.testing.assert_array_equal(read(path, chunk_size=1), [[1, 2], [3, 4]])
+
+
+def test_whitespace_and_semicolon_delimiters(tmp_path):
+    spaces = tmp_path / "library.txt"
+    spaces.write_text("1 2\n3 4\n")
+    semicolons = tmp_path / "semicolons.csv"
+    semicolons.write_text("1;2;\n3;4;\n")
+    np.testing.assert_array_equal(read(spaces), [[1, 2], [3, 4]])
+    np.testing.assert_array_equal(read(semicolons), [[1, 2], [3, 4]])
+
+
+def test_inconsistent_record_width_raises(tmp_path):
+    path = tmp_path / "library.csv"
+    path.write_text("1,2\n3,4,5\n")
+    with pytest.raises(ValueError):
+        read(path, chunk_size=1)
+
+
+def test_binary_formats_match(tmp_path):
+    spectra = np.random.default_rng(0).random((10, 7))
+    np.save(tmp_path / "library.npy", spectra)
+    spectra.astype("<f4").tofile(tmp_path / "library.raw")
+    chunks = list(iter_spectral_library(tmp_path / "library.npy", chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate(chunks), spectra)
+    raw = read(tmp_path / "library.raw", record_length=7, dtype="<f4")
+    np.testing.assert_allclose(raw, spectra, rtol=1e-6)
+    with pytest.raises(ValueError):
+        read(tmp_path / "library.raw", record_length=6, dtype="<f4")
@@ -0,0 +1,16 @@
+import numpy as np
+
+from utils import _write_table_cache, get_table_cache_path
+
+
+def test_stale_caches_of_other_sources_are_kept(tmp_path):
+    table = np.zeros((2, 4))
+    other = get_table_cache_path(tmp_path / "cie-1964.txt", 10, 1)
+    _write_table_cache(other, table)
+    stale = get_table_cache_path(tmp_path / "cie.txt", 10, 1)
+    _write_table_cache(stale, table)
+    fresh = get_table_cache_path(tmp_path / "cie.txt", 12, 2)
+    _write_table_cache(fresh, table)
+    assert other.exists()
+    assert fresh.exists()
+    assert not stale.exists()